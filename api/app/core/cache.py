@@ -0,0 +1,137 @@
+"""
+Caching helpers: in-process TTL memoization and the shared forecast cache
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Dict, Hashable, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def async_ttl_cache(ttl_seconds: float, maxsize: int = 1024):
+    """Cache an async function's results per argument tuple for ttl_seconds
+
+    Concurrent calls with the same arguments share a single evaluation.
+    Exceptions are not cached. Arguments must be hashable; for methods the
+    instance is part of the key.
+    """
+    def decorator(func):
+        # key -> (monotonic expiry, value), oldest first
+        entries: Dict[Hashable, Tuple[float, Any]] = {}
+        # key -> (lock, callers using it); dropped once no caller holds or
+        # waits on it, so failed keys don't accumulate locks
+        locks: Dict[Hashable, Tuple[asyncio.Lock, int]] = {}
+
+        def lookup(key: Hashable):
+            entry = entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return True, entry[1]
+            return False, None
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            hit, value = lookup(key)
+            if hit:
+                return value
+
+            lock, users = locks.get(key, (None, 0))
+            if lock is None:
+                lock = asyncio.Lock()
+            locks[key] = (lock, users + 1)
+            try:
+                async with lock:
+                    # Another caller may have resolved it while we waited
+                    hit, value = lookup(key)
+                    if hit:
+                        return value
+
+                    value = await func(*args, **kwargs)
+                    entries.pop(key, None)
+                    entries[key] = (time.monotonic() + ttl_seconds, value)
+                    while len(entries) > maxsize:
+                        del entries[next(iter(entries))]
+                    return value
+            finally:
+                lock, users = locks[key]
+                if users == 1:
+                    del locks[key]
+                else:
+                    locks[key] = (lock, users - 1)
+
+        def cache_clear():
+            entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+class CacheBackend(Protocol):
+    """Shared key/value store with per-key expiry"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    async def setex(self, key: str, ttl: int, value: bytes) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class RedisCacheBackend:
+    """CacheBackend on Redis; errors are logged and treated as misses
+
+    After a failure the backend stays off for RETRY_AFTER seconds, so an
+    unreachable Redis costs one failed call rather than one per request.
+    """
+
+    RETRY_AFTER = 30.0  # seconds
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url, socket_connect_timeout=0.5, socket_timeout=0.5)
+        self._disabled_until = 0.0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    def _failed(self, e: Exception):
+        logger.warning(f"Redis cache unavailable, retrying in {self.RETRY_AFTER:.0f}s: {e}")
+        self._disabled_until = time.monotonic() + self.RETRY_AFTER
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if not self._available():
+            return None
+        try:
+            return await self._redis.get(key)
+        except Exception as e:
+            self._failed(e)
+            return None
+
+    async def setex(self, key: str, ttl: int, value: bytes) -> None:
+        if not self._available():
+            return
+        try:
+            await self._redis.setex(key, ttl, value)
+        except Exception as e:
+            self._failed(e)
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def get_cache_backend(url: str) -> Optional[CacheBackend]:
+    """Shared cache for url, or None when unset or the redis package is missing"""
+    if not url:
+        return None
+    try:
+        return RedisCacheBackend(url)
+    except ImportError:
+        logger.warning("redis not installed; shared cache disabled. Install with: pip install redis")
+        return None
@@ -0,0 +1,34 @@
+"""
+Cached wall-clock timestamp for high-frequency endpoints
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+# Refreshed once per second by run_clock() while the app is running
+_now_iso: str = ""
+_ticking: bool = False
+
+
+def _format_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def now_iso() -> str:
+    """Current UTC time as an ISO 8601 string, at one-second resolution"""
+    if _ticking:
+        return _now_iso
+    # Clock task not running (scripts, tests): format on demand
+    return _format_now()
+
+
+async def run_clock():
+    """Background task that keeps the cached timestamp current"""
+    global _now_iso, _ticking
+    try:
+        while True:
+            _now_iso = _format_now()
+            _ticking = True
+            await asyncio.sleep(1.0)
+    finally:
+        _ticking = False
@@ -6,11 +6,23 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.core.config import settings
 
+# PgBouncer transaction pooling hands each transaction to a different server
+# connection, so asyncpg must not rely on server-side prepared statements
+connect_args = {}
+if settings.DB_PGBOUNCER:
+    connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=connect_args,
 )
 
 # Create session factory
@@ -3,14 +3,19 @@ OneWeather FastAPI Application
 Main entry point for the weather intelligence API
 """
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import logging
 
-from app.core.config import settings
-# from app.core.database import engine, Base  # Disabled for Phase 1
+from app.core import clock
+from app.core.config import Settings, get_settings, settings
+# from app.core.database import engine  # Disabled for Phase 1
 from app.routers import health, simple_forecast
+from app.services.simple_weather import simple_weather
 
 # Configure logging
 logging.basicConfig(
@@ -27,17 +32,18 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting OneWeather API")
-    
-    # Database initialization disabled for Phase 1
-    # if settings.ENVIRONMENT == "development":
-    #     logger.info("Creating database tables...")
-    #     async with engine.begin() as conn:
-    #         await conn.run_sync(Base.metadata.create_all)
+    clock_task = asyncio.create_task(clock.run_clock())
+    await simple_weather.startup()
+    # Schema is owned by db/init.sql (`make init-db`), never created at startup
     
     yield
     
     # Shutdown
     logger.info("Shutting down OneWeather API")
+    await simple_weather.shutdown()
+    clock_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await clock_task
     # await engine.dispose()  # Disabled for Phase 1
 
 
@@ -49,6 +55,7 @@ app = FastAPI(
     docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -61,13 +68,16 @@ if settings.CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Compress larger responses (multi-day forecasts repeat the same keys per point)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(simple_forecast.router, prefix="/api/v1/forecast", tags=["forecast"])
 
 
 @app.get("/")
-async def root():
+async def root(config: Settings = Depends(get_settings)):
     """
     Root endpoint
     """
@@ -75,7 +85,7 @@ async def root():
         "name": "OneWeather API",
         "version": "0.1.0",
         "description": "Accuracy-first weather intelligence platform",
-        "docs": "/docs" if settings.ENVIRONMENT != "production" else None,
+        "docs": "/docs" if config.ENVIRONMENT != "production" else None,
         "health": "/health",
     }
 
@@ -89,4 +99,6 @@ if __name__ == "__main__":
         port=settings.API_PORT,
         reload=settings.RELOAD,
         workers=settings.API_WORKERS if not settings.RELOAD else 1,
+        loop="uvloop",
+        http="httptools",
     )
\ No newline at end of file
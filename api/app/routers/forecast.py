@@ -3,21 +3,51 @@ Forecast API endpoints
 """
 
 from fastapi import APIRouter, HTTPException, Query, Path
-from typing import List, Optional
-from datetime import datetime, timedelta
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 import logging
+import orjson
 
-from app.services.weather_sources import weather_manager, ForecastPoint
+from app.services.weather_sources import weather_manager, ForecastPoint, ForecastSeries
 from app.schemas.forecast import ForecastResponse, ForecastPointResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Forecasts longer than this are streamed point by point instead of buffered
+STREAMING_MIN_HOURS = 48
+
+# ForecastPoint attributes exposed in the response, in ForecastPointResponse order
+POINT_FIELDS = (
+    "timestamp",
+    "temperature_c",
+    "precipitation_mm",
+    "precipitation_probability",
+    "wind_speed_mps",
+    "wind_direction_deg",
+    "humidity_percent",
+    "cloud_cover_percent",
+    "pressure_hpa",
+    "source",
+)
+
+
+async def _stream_forecast(body: Dict, points: ForecastSeries) -> AsyncIterator[bytes]:
+    """Yield a ForecastResponse document with its points serialized one at a time"""
+    # OPT_UTC_Z keeps datetimes identical to the buffered (pydantic) output
+    yield orjson.dumps(body, option=orjson.OPT_UTC_Z)[:-1] + b',"points":['
+    for i, point in enumerate(points):
+        record = {field: getattr(point, field) for field in POINT_FIELDS}
+        yield (b"," if i else b"") + orjson.dumps(record, option=orjson.OPT_UTC_Z)
+    yield b"]}"
+
 
 @router.get("/{latitude}/{longitude}", response_model=ForecastResponse)
 async def get_forecast(
-    latitude: float = Path(..., ge=-90, le=90, description="Latitude"),
-    longitude: float = Path(..., ge=-180, le=180, description="Longitude"),
+    # Phase 1 only supports CONUS (24°N-50°N, 125°W-66°W)
+    latitude: float = Path(..., ge=24, le=50, description="Latitude (CONUS only)"),
+    longitude: float = Path(..., ge=-125, le=-66, description="Longitude (CONUS only)"),
     hours: Optional[int] = Query(24, ge=1, le=168, description="Hours of forecast to return"),
     include_sources: Optional[bool] = Query(False, description="Include individual source forecasts"),
 ):
@@ -27,13 +57,6 @@ async def get_forecast(
     Returns a forecast blended from multiple weather sources using simple averaging.
     """
     try:
-        # Validate CONUS (for Phase 1)
-        if not (24 <= latitude <= 50 and -125 <= longitude <= -66):
-            raise HTTPException(
-                status_code=400,
-                detail="Phase 1 only supports CONUS (24°N-50°N, 125°W-66°W)"
-            )
-        
         logger.info(f"Getting forecast for {latitude}, {longitude}")
         
         # Get forecasts from all sources
@@ -45,9 +68,38 @@ async def get_forecast(
         # Use all forecast points for now (time filtering disabled)
         filtered_forecast = blended_forecast[:hours] if hours < len(blended_forecast) else blended_forecast
         
-        # Convert to response format
+        # Prepare source details if requested
+        source_details = None
+        if include_sources:
+            source_details = {}
+            for source_name, points in source_forecasts.items():
+                if points:
+                    source_details[source_name] = {
+                        "count": len(points),
+                        "first_timestamp": points[0].timestamp,
+                        "last_timestamp": points[-1].timestamp,
+                    }
+        
+        if hours > STREAMING_MIN_HOURS:
+            body = {
+                "latitude": latitude,
+                "longitude": longitude,
+                "forecast_hours": hours,
+                "generated_at": datetime.now(timezone.utc),
+                "sources_used": list(source_forecasts.keys()),
+                "source_details": source_details,
+                "blending_method": "simple_average",
+            }
+            logger.info(f"Streaming {len(filtered_forecast)} forecast points")
+            return StreamingResponse(
+                _stream_forecast(body, filtered_forecast),
+                media_type="application/json",
+            )
+        
+        # Convert to response format; values come from our own blend, so
+        # skip re-validation here (the response_model still validates once)
         forecast_points = [
-            ForecastPointResponse(
+            ForecastPointResponse.model_construct(
                 timestamp=point.timestamp,
                 temperature_c=point.temperature_c,
                 precipitation_mm=point.precipitation_mm,
@@ -62,23 +114,11 @@ async def get_forecast(
             for point in filtered_forecast
         ]
         
-        # Prepare source details if requested
-        source_details = None
-        if include_sources:
-            source_details = {}
-            for source_name, points in source_forecasts.items():
-                if points:
-                    source_details[source_name] = {
-                        "count": len(points),
-                        "first_timestamp": points[0].timestamp.isoformat() if points else None,
-                        "last_timestamp": points[-1].timestamp.isoformat() if points else None,
-                    }
-        
-        response = ForecastResponse(
+        response = ForecastResponse.model_construct(
             latitude=latitude,
             longitude=longitude,
             forecast_hours=hours,
-            generated_at=datetime.utcnow(),
+            generated_at=datetime.now(timezone.utc),
             points=forecast_points,
             sources_used=list(source_forecasts.keys()),
             source_details=source_details,
@@ -88,8 +128,6 @@ async def get_forecast(
         logger.info(f"Returning {len(forecast_points)} forecast points")
         return response
         
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Error getting forecast: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -114,7 +152,7 @@ async def get_source_status():
     return {
         "sources": sources,
         "total_sources": len(sources),
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
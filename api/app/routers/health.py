@@ -3,19 +3,38 @@ Health check endpoints
 """
 
 from fastapi import APIRouter
-from datetime import datetime
 import psutil
 import os
+import time
+
+from app.core.clock import now_iso
 
 router = APIRouter()
 
+# psutil reads /proc on every call; probes share one snapshot per second
+SYSTEM_SNAPSHOT_TTL = 1.0
+_system_cache = {"ts": 0.0, "data": {}}
+
+
+def _system_snapshot() -> dict:
+    """CPU, memory and disk usage, refreshed at most once per TTL"""
+    now = time.monotonic()
+    if now - _system_cache["ts"] > SYSTEM_SNAPSHOT_TTL:
+        _system_cache["data"] = {
+            "cpu_percent": psutil.cpu_percent(),
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_usage": psutil.disk_usage("/").percent,
+        }
+        _system_cache["ts"] = now
+    return _system_cache["data"]
+
 
 @router.get("/")
 async def health_check():
     """Basic health check"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": now_iso(),
         "service": "OneWeather API",
         "version": "0.1.0"
     }
@@ -26,10 +45,8 @@ async def system_health():
     """System health information"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "cpu_percent": psutil.cpu_percent(),
-        "memory_percent": psutil.virtual_memory().percent,
-        "disk_usage": psutil.disk_usage("/").percent,
+        "timestamp": now_iso(),
+        **_system_snapshot(),
         "process_id": os.getpid()
     }
 
@@ -40,5 +57,5 @@ async def readiness_check():
     # Add database connection check here when we have DB
     return {
         "status": "ready",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": now_iso()
     }
\ No newline at end of file
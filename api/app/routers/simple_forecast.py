@@ -2,51 +2,63 @@
 Simple forecast endpoint that actually works
 """
 
-from fastapi import APIRouter, HTTPException
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from datetime import datetime, timezone
 import logging
 
-from app.services.simple_weather import simple_weather, SimpleForecastPoint
+from app.services.simple_weather import simple_weather
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in tags or "*" in tags
+
+
 @router.get("/{latitude}/{longitude}")
-async def get_simple_forecast(latitude: float, longitude: float, hours: int = 24):
+async def get_simple_forecast(
+    request: Request,
+    response: Response,
+    latitude: float = Path(..., ge=-90, le=90, description="Latitude"),
+    longitude: float = Path(..., ge=-180, le=180, description="Longitude"),
+    hours: int = Query(24, ge=1, le=168, description="Hours of forecast to return"),
+):
     """
     Get simple weather forecast that actually works
     """
     try:
-        # Validate coordinates
-        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
-            raise HTTPException(status_code=400, detail="Invalid coordinates")
-        
         logger.info(f"Getting forecast for {latitude}, {longitude}")
         
         # Get forecast
-        points = await simple_weather.get_forecast(latitude, longitude)
+        batch = await simple_weather.get_forecast(latitude, longitude, hours)
         
-        # Limit to requested hours
-        points = points[:hours]
+        # Let clients (and any CDN in front) revalidate instead of re-downloading
+        if batch.source == "fallback":
+            response.headers["Cache-Control"] = "no-store"
+        else:
+            etag = f'"{batch.fingerprint()}"'
+            cache_headers = {
+                "ETag": etag,
+                "Cache-Control": f"public, max-age={simple_weather.CACHE_TTL}",
+            }
+            if _etag_matches(request, etag):
+                return Response(status_code=304, headers=cache_headers)
+            response.headers.update(cache_headers)
         
         # Convert to response format
-        forecast_points = []
-        for point in points:
-            forecast_points.append({
-                "timestamp": point.timestamp.isoformat(),
-                "temperature_c": point.temperature_c,
-                "precipitation_mm": point.precipitation_mm,
-                "wind_speed_mps": point.wind_speed_mps,
-                "humidity_percent": point.humidity_percent,
-                "source": point.source
-            })
+        forecast_points = batch.to_records()
         
-        response = {
+        body = {
             "latitude": latitude,
             "longitude": longitude,
             "forecast_hours": len(forecast_points),
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": datetime.now(timezone.utc),
             "points": forecast_points,
             "sources_used": ["openmeteo"],
             "blending_method": "direct",
@@ -54,16 +66,14 @@ async def get_simple_forecast(latitude: float, longitude: float, hours: int = 24
         }
         
         logger.info(f"Returning {len(forecast_points)} forecast points")
-        return response
+        return body
         
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Error in simple forecast: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/ardmore/demo")
-async def get_ardmore_forecast():
+async def get_ardmore_forecast(request: Request, response: Response):
     """Get forecast for Ardmore, PA (demo location)"""
-    return await get_simple_forecast(40.0048, -75.2923, hours=12)
\ No newline at end of file
+    return await get_simple_forecast(request, response, 40.0048, -75.2923, hours=12)
\ No newline at end of file
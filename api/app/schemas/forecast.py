@@ -2,13 +2,15 @@
 Forecast API schemas
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 
 class ForecastPointResponse(BaseModel):
     """Individual forecast point"""
+    model_config = ConfigDict(defer_build=True)
+    
     timestamp: datetime
     temperature_c: Optional[float] = Field(None, description="Temperature in Celsius")
     precipitation_mm: Optional[float] = Field(None, description="Precipitation in mm")
@@ -19,15 +21,12 @@ class ForecastPointResponse(BaseModel):
     cloud_cover_percent: Optional[float] = Field(None, description="Cloud cover percentage")
     pressure_hpa: Optional[float] = Field(None, description="Pressure in hectopascals")
     source: str = Field(..., description="Source of this forecast point")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class ForecastResponse(BaseModel):
     """Complete forecast response"""
+    model_config = ConfigDict(defer_build=True)
+    
     latitude: float
     longitude: float
     forecast_hours: int
@@ -36,23 +35,15 @@ class ForecastResponse(BaseModel):
     sources_used: List[str]
     source_details: Optional[Dict[str, Any]] = None
     blending_method: str = Field(..., description="Method used to blend forecasts")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class SourceStatusResponse(BaseModel):
     """Weather source status"""
+    model_config = ConfigDict(defer_build=True)
+    
     name: str
     display_name: str
     cache_ttl: int
     last_fetch: Optional[str]
     cache_size: int
     status: str = "unknown"
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
@@ -2,102 +2,189 @@
 Simple weather source for immediate demo
 """
 
+import asyncio
+import hashlib
 import httpx
 import logging
+import numpy as np
+import orjson
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
-class SimpleForecastPoint:
-    """Simplified forecast point"""
-    timestamp: datetime
-    temperature_c: float
-    precipitation_mm: float
-    wind_speed_mps: float
-    humidity_percent: float
+class ForecastBatch:
+    """Simplified forecast stored column-wise, one array per field"""
+    timestamps: np.ndarray  # datetime64[s], UTC
+    temperature_c: np.ndarray
+    precipitation_mm: np.ndarray
+    wind_speed_mps: np.ndarray
+    humidity_percent: np.ndarray
     source: str
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def fingerprint(self) -> str:
+        """Digest of the forecast values, used as an HTTP ETag"""
+        digest = hashlib.md5(self.source.encode())
+        for column in (self.timestamps, self.temperature_c, self.precipitation_mm,
+                       self.wind_speed_mps, self.humidity_percent):
+            digest.update(column.tobytes())
+        return digest.hexdigest()
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize one dict per hour for the JSON response"""
+        keys = ("timestamp", "temperature_c", "precipitation_mm",
+                "wind_speed_mps", "humidity_percent", "source")
+        return [
+            dict(zip(keys, row))
+            for row in zip(
+                self.timestamps.tolist(),
+                self.temperature_c.tolist(),
+                self.precipitation_mm.tolist(),
+                self.wind_speed_mps.tolist(),
+                self.humidity_percent.tolist(),
+                [self.source] * len(self),
+            )
+        ]
 
 
 class SimpleWeatherAPI:
     """Simple weather API that actually works"""
     
+    HOURLY_VARIABLES = "temperature_2m,precipitation,relative_humidity_2m,wind_speed_10m"
+    CACHE_TTL = 600  # seconds
+    CACHE_MAX_ENTRIES = 1024
+    
     def __init__(self):
         self.base_url = "https://api.open-meteo.com/v1/forecast"
+        self.client: Optional[httpx.AsyncClient] = None
+        # (lat, lon, hours), lat/lon rounded to ~1 km -> (fetched_at, batch), oldest first
+        self._cache: "OrderedDict[Tuple[float, float, int], Tuple[float, ForecastBatch]]" = OrderedDict()
+        # Fetch in progress per key, so concurrent misses share one upstream
+        # request and its result (fallback included); removed once done
+        self._inflight: Dict[Tuple[float, float, int], "asyncio.Task[ForecastBatch]"] = {}
+    
+    def _cache_get(self, key: Tuple[float, float, int]) -> Optional[ForecastBatch]:
+        """Return cached forecast for key if still fresh"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        fetched_at, batch = entry
+        if time.monotonic() - fetched_at >= self.CACHE_TTL:
+            return None
+        return batch
+    
+    def _cache_put(self, key: Tuple[float, float, int], batch: ForecastBatch):
+        """Store forecast for key, evicting the oldest entries past the size cap"""
+        self._cache[key] = (time.monotonic(), batch)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+    
+    async def get_forecast(self, latitude: float, longitude: float, hours: int = 24) -> ForecastBatch:
+        """Get simple forecast from Open-Meteo, served from cache when fresh"""
+        key = (round(latitude, 2), round(longitude, 2), hours)
+        
+        batch = self._cache_get(key)
+        if batch is not None:
+            return batch
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_cache(key, latitude, longitude, hours))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller going away doesn't cancel the others' fetch
+        return await asyncio.shield(task)
+    
+    async def _fetch_and_cache(self, key: Tuple[float, float, int], latitude: float,
+                               longitude: float, hours: int) -> ForecastBatch:
+        """Fetch the forecast for key and cache it, or return fallback data"""
+        batch = await self._fetch_forecast(latitude, longitude, hours)
+        if batch is None:
+            # Fallback data is never cached so the next request retries upstream
+            return self.get_fallback_forecast(hours)
+        
+        self._cache_put(key, batch)
+        return batch
     
-    async def get_forecast(self, latitude: float, longitude: float) -> List[SimpleForecastPoint]:
-        """Get simple forecast from Open-Meteo"""
+    async def startup(self):
+        """Create the shared HTTP client (called from the app lifespan)"""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+    
+    async def shutdown(self):
+        """Close the shared HTTP client"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+    
+    async def _fetch_forecast(self, latitude: float, longitude: float, hours: int) -> Optional[ForecastBatch]:
+        """Fetch forecast from Open-Meteo, returning None on failure"""
         try:
-            url = f"{self.base_url}?latitude={latitude}&longitude={longitude}"
-            url += "&hourly=temperature_2m,precipitation,relative_humidity_2m,wind_speed_10m"
-            url += "&forecast_days=2"
+            if self.client is None:
+                # Used outside the app lifespan (scripts, tests)
+                await self.startup()
+            
+            response = await self.client.get(
+                self.base_url,
+                params={
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "hourly": self.HOURLY_VARIABLES,
+                    "forecast_hours": hours,
+                },
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            
+            hourly = data.get("hourly", {})
+            
+            batch = ForecastBatch(
+                # Parse all ISO timestamps in one C-level pass
+                timestamps=np.array(hourly.get("time", []), dtype="datetime64[s]"),
+                temperature_c=np.asarray(hourly.get("temperature_2m", []), dtype=np.float64),
+                precipitation_mm=np.asarray(hourly.get("precipitation", []), dtype=np.float64),
+                wind_speed_mps=np.asarray(hourly.get("wind_speed_10m", []), dtype=np.float64),
+                humidity_percent=np.asarray(hourly.get("relative_humidity_2m", []), dtype=np.float64),
+                source="openmeteo",
+            )
+            
+            logger.info(f"Got {len(batch)} forecast points")
+            return batch
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-                
-                points = []
-                hourly = data.get("hourly", {})
-                times = hourly.get("time", [])
-                temps = hourly.get("temperature_2m", [])
-                precip = hourly.get("precipitation", [])
-                humidity = hourly.get("relative_humidity_2m", [])
-                wind = hourly.get("wind_speed_10m", [])
-                
-                for i in range(min(24, len(times))):  # Just 24 hours
-                    try:
-                        time_str = times[i]
-                        # Parse ISO timestamp
-                        if time_str.endswith('Z'):
-                            time_str = time_str[:-1] + '+00:00'
-                        timestamp = datetime.fromisoformat(time_str)
-                        
-                        point = SimpleForecastPoint(
-                            timestamp=timestamp,
-                            temperature_c=temps[i] if i < len(temps) else 15.0,
-                            precipitation_mm=precip[i] if i < len(precip) else 0.0,
-                            wind_speed_mps=wind[i] if i < len(wind) else 3.0,
-                            humidity_percent=humidity[i] if i < len(humidity) else 60.0,
-                            source="openmeteo"
-                        )
-                        points.append(point)
-                    except (ValueError, IndexError):
-                        continue
-                
-                logger.info(f"Got {len(points)} forecast points")
-                return points
-                
         except Exception as e:
             logger.error(f"Error getting forecast: {e}")
-            # Return some fallback data
-            return self.get_fallback_forecast()
+            return None
     
-    def get_fallback_forecast(self) -> List[SimpleForecastPoint]:
+    def get_fallback_forecast(self, hours: int = 24) -> ForecastBatch:
         """Fallback forecast if API fails"""
-        points = []
-        now = datetime.now(timezone.utc)
+        now = np.datetime64(int(datetime.now(timezone.utc).timestamp()), "s")
+        timestamps = now + np.arange(hours) * np.timedelta64(1, "h")
         
-        for i in range(24):
-            timestamp = datetime.fromtimestamp(now.timestamp() + i * 3600, tz=timezone.utc)
-            # Simple temperature curve
-            hour = timestamp.hour
-            temp = 15 + 5 * (1 - abs(hour - 14) / 7)  # Peaks at 2 PM
-            
-            point = SimpleForecastPoint(
-                timestamp=timestamp,
-                temperature_c=temp,
-                precipitation_mm=0.0,
-                wind_speed_mps=3.0,
-                humidity_percent=60.0,
-                source="fallback"
-            )
-            points.append(point)
+        # Simple temperature curve
+        hour = timestamps.astype("datetime64[h]").astype(np.int64) % 24
+        temp = 15 + 5 * (1 - np.abs(hour - 14) / 7)  # Peaks at 2 PM
         
-        return points
+        return ForecastBatch(
+            timestamps=timestamps,
+            temperature_c=temp,
+            precipitation_mm=np.zeros(hours),
+            wind_speed_mps=np.full(hours, 3.0),
+            humidity_percent=np.full(hours, 60.0),
+            source="fallback",
+        )
 
 
 # Global instance
@@ -5,16 +5,34 @@ Free tier APIs for Phase 1
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-import json
-from dataclasses import dataclass
+import re
+import time
+import warnings
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Tuple
+import orjson
+from dataclasses import dataclass, field
 import httpx
+import numpy as np
+import pandas as pd
+
+from app.core.cache import CacheBackend, async_ttl_cache, get_cache_backend
+from app.core.config import settings
+
+# Optional: compiles the blend kernel; without it the NumPy version is used
+try:
+    import numba
+except ImportError:
+    numba = None
 
 logger = logging.getLogger(__name__)
 
+# First number in a Weather.gov wind speed such as "10 mph" or "5 to 10 mph"
+_WIND_SPEED_RE = re.compile(r'(\d+(?:\.\d+)?)')
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ForecastPoint:
     """Standardized forecast data point"""
     timestamp: datetime
@@ -31,214 +49,498 @@ class ForecastPoint:
     longitude: float
 
 
+# Numeric ForecastPoint fields, stored as SERIES_DTYPE columns in ForecastSeries
+SERIES_FIELDS = (
+    "temperature_c",
+    "precipitation_mm",
+    "precipitation_probability",
+    "wind_speed_mps",
+    "wind_direction_deg",
+    "humidity_percent",
+    "cloud_cover_percent",
+    "pressure_hpa",
+)
+
+# Weather values carry only a few significant digits, so single precision
+# halves memory traffic without losing anything the sources report
+SERIES_DTYPE = np.float32
+
+
+# Decimals kept when converting back to Python floats; sources report at most
+# two, and float32 error stays below half of the third for values under ~8000
+OUTPUT_DECIMALS = 3
+
+
+def _optional(column: np.ndarray) -> list:
+    """Column values as Python floats, with NaN mapped back to None"""
+    # Rounding drops float32 noise, so 12.2 comes back as 12.2 rather
+    # than 12.199999809265137
+    values = np.round(column.astype(np.float64), OUTPUT_DECIMALS).astype(object)
+    values[np.isnan(column)] = None
+    return values.tolist()
+
+
+@dataclass
+class ForecastSeries:
+    """Forecast stored column-wise, one SERIES_DTYPE array per field (NaN where missing)
+    
+    Behaves as a read-only sequence of ForecastPoint, materialized on access.
+    """
+    timestamps: np.ndarray  # datetime64[s], UTC
+    temperature_c: np.ndarray
+    precipitation_mm: np.ndarray
+    precipitation_probability: np.ndarray
+    wind_speed_mps: np.ndarray
+    wind_direction_deg: np.ndarray
+    humidity_percent: np.ndarray
+    cloud_cover_percent: np.ndarray
+    pressure_hpa: np.ndarray
+    sources: np.ndarray  # source name per row
+    latitude: float
+    longitude: float
+    
+    @classmethod
+    def from_columns(cls, timestamps: np.ndarray, source: str,
+                     latitude: float, longitude: float, **columns: np.ndarray) -> "ForecastSeries":
+        """Build a single-source series; fields not given are all NaN"""
+        n = len(timestamps)
+        return cls(
+            timestamps=timestamps.astype("datetime64[s]"),
+            **{
+                name: np.asarray(columns.get(name, np.full(n, np.nan)), dtype=SERIES_DTYPE)
+                for name in SERIES_FIELDS
+            },
+            sources=np.full(n, source, dtype=object),
+            latitude=latitude,
+            longitude=longitude,
+        )
+    
+    @classmethod
+    def empty(cls, latitude: float, longitude: float) -> "ForecastSeries":
+        return cls.from_columns(np.empty(0, dtype="datetime64[s]"), "", latitude, longitude)
+    
+    @classmethod
+    def concat(cls, series: List["ForecastSeries"]) -> "ForecastSeries":
+        """Stack several series row-wise, keeping their order"""
+        first = series[0]
+        return cls(
+            timestamps=np.concatenate([s.timestamps for s in series]),
+            **{name: np.concatenate([getattr(s, name) for s in series]) for name in SERIES_FIELDS},
+            sources=np.concatenate([s.sources for s in series]),
+            latitude=first.latitude,
+            longitude=first.longitude,
+        )
+    
+    def to_bytes(self) -> bytes:
+        """Serialize for the shared cache (NaN is stored as null)"""
+        return orjson.dumps(
+            {
+                "timestamps": self.timestamps.astype(np.int64),
+                # Blended and sliced columns are strided views, which orjson rejects
+                **{name: np.ascontiguousarray(getattr(self, name)) for name in SERIES_FIELDS},
+                "sources": self.sources.tolist(),
+                "latitude": self.latitude,
+                "longitude": self.longitude,
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+    
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "ForecastSeries":
+        data = orjson.loads(payload)
+        return cls(
+            timestamps=np.array(data["timestamps"], dtype=np.int64).astype("datetime64[s]"),
+            **{name: np.array(data[name], dtype=SERIES_DTYPE) for name in SERIES_FIELDS},
+            sources=np.array(data["sources"], dtype=object),
+            latitude=data["latitude"],
+            longitude=data["longitude"],
+        )
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ForecastSeries(
+                timestamps=self.timestamps[index],
+                **{name: getattr(self, name)[index] for name in SERIES_FIELDS},
+                sources=self.sources[index],
+                latitude=self.latitude,
+                longitude=self.longitude,
+            )
+        if not -len(self) <= index < len(self):
+            raise IndexError("ForecastSeries index out of range")
+        return next(iter(self[index:index + 1 or None]))
+    
+    def __iter__(self):
+        rows = zip(
+            self.timestamps.tolist(),
+            *(_optional(getattr(self, name)) for name in SERIES_FIELDS),
+            self.sources.tolist(),
+        )
+        for timestamp, *values, source in rows:
+            yield ForecastPoint(
+                timestamp,
+                *values,
+                source=source,
+                latitude=self.latitude,
+                longitude=self.longitude,
+            )
+
+
+@dataclass
+class CircuitBreaker:
+    """Skips a failing source for a cooldown period after repeated failures"""
+    threshold: int = 5
+    base_cooldown: float = 30.0
+    max_cooldown: float = 300.0
+    failures: int = 0
+    cooldown: float = field(init=False)
+    opened_at: Optional[float] = None
+    
+    def __post_init__(self):
+        self.cooldown = self.base_cooldown
+    
+    def allow(self) -> bool:
+        """Whether a request may be sent to the source now"""
+        if self.opened_at is None:
+            return True
+        # After the cooldown, let requests through to probe the source (half-open)
+        return time.monotonic() - self.opened_at >= self.cooldown
+    
+    def record_success(self):
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.opened_at = None
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.opened_at is not None:
+            # Probe failed while half-open: back off exponentially
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self.opened_at = time.monotonic()
+        elif self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
 class WeatherSource:
     """Base class for all weather data sources"""
     
+    CACHE_MAX_ENTRIES = 1024
+    # Entries older than cache_ttl are served stale, with a background
+    # refresh, until they reach cache_ttl * STALE_FACTOR
+    STALE_FACTOR = 6
+    
     def __init__(self, name: str, cache_ttl: int = 300):
         self.name = name
         self.cache_ttl = cache_ttl
         self.last_fetch = None
-        self.cache = None
+        # (lat, lon) rounded to ~100m -> (monotonic fetch time, points, refreshing), oldest first
+        self.cache: "OrderedDict[Tuple[float, float], Tuple[float, ForecastSeries, bool]]" = OrderedDict()
+        # Strong references to in-flight background refreshes
+        self._refresh_tasks: set = set()
+        # Extra request headers for this source's HTTP client
+        self.headers: Dict[str, str] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        # Optional cache shared by all workers, consulted on a local miss
+        self.shared_cache: Optional[CacheBackend] = None
+        # Tracks upstream fetches only; cache hits neither open nor close it
+        self.breaker = CircuitBreaker()
     
-    async def get_forecast(self, latitude: float, longitude: float) -> List[ForecastPoint]:
-        """Get forecast for a specific location"""
+    async def get_forecast(self, latitude: float, longitude: float) -> ForecastSeries:
+        """Get forecast for a specific location, served from cache while usable"""
+        key = (round(latitude, 3), round(longitude, 3))
+        entry = self.cache.get(key)
+        if entry is None and self.shared_cache is not None:
+            entry = await self._shared_get(key)
+        if entry is not None:
+            fetched_at, points, refreshing = entry
+            self.cache.move_to_end(key)
+            age = time.monotonic() - fetched_at
+            if age < self.cache_ttl:
+                return points
+            if age < self.cache_ttl * self.STALE_FACTOR:
+                # Stale but usable: answer now, refresh once in the background
+                if not refreshing and self.breaker.allow():
+                    self.cache[key] = (fetched_at, points, True)
+                    task = asyncio.create_task(self._revalidate(key, latitude, longitude))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_tasks.discard)
+                return points
+        
+        if not self.breaker.allow():
+            logger.info(f"Source {self.name} skipped: circuit open")
+            return ForecastSeries.empty(latitude, longitude)
+        return await self._refresh(key, latitude, longitude)
+    
+    async def _fetch_forecast(self, latitude: float, longitude: float) -> ForecastSeries:
+        """Fetch a forecast from the upstream API"""
         raise NotImplementedError
     
-    def _standardize_response(self, raw_data: Dict, latitude: float, longitude: float) -> List[ForecastPoint]:
-        """Convert source-specific format to standardized ForecastPoint"""
+    async def _refresh(self, key: Tuple[float, float], latitude: float, longitude: float) -> ForecastSeries:
+        """Fetch from upstream and store the result under key
+        
+        Errors propagate; the caller records them on the breaker.
+        """
+        points = await self._fetch_forecast(latitude, longitude)
+        self.breaker.record_success()
+        self.last_fetch = datetime.now(timezone.utc)
+        # Don't pin an empty result for a whole TTL
+        if points:
+            self._cache_put(key, points)
+            if self.shared_cache is not None:
+                await self._shared_put(key, points)
+        return points
+    
+    async def _revalidate(self, key: Tuple[float, float], latitude: float, longitude: float):
+        """Background refresh of a stale entry; failures keep serving the stale points"""
+        try:
+            await self._refresh(key, latitude, longitude)
+        except Exception as e:
+            logger.warning(f"{self.name} background refresh failed: {e}")
+            self.breaker.record_failure()
+        finally:
+            entry = self.cache.get(key)
+            if entry is not None and entry[2]:
+                self.cache[key] = (entry[0], entry[1], False)
+    
+    def _shared_key(self, key: Tuple[float, float]) -> str:
+        return f"wx:{self.name}:{key[0]}:{key[1]}"
+    
+    async def _shared_get(self, key: Tuple[float, float]):
+        """Local cache entry rebuilt from the shared cache, or None"""
+        payload = await self.shared_cache.get(self._shared_key(key))
+        if payload is None:
+            return None
+        fetched_at, series = payload.split(b"\n", 1)
+        # Carry over the original fetch age so staleness is judged as if fetched here
+        age = max(time.time() - float(fetched_at), 0.0)
+        entry = (time.monotonic() - age, ForecastSeries.from_bytes(series), False)
+        self.cache[key] = entry
+        while len(self.cache) > self.CACHE_MAX_ENTRIES:
+            self.cache.popitem(last=False)
+        return entry
+    
+    async def _shared_put(self, key: Tuple[float, float], points: ForecastSeries):
+        """Publish points to the shared cache for as long as they are servable"""
+        payload = f"{time.time()}\n".encode() + points.to_bytes()
+        await self.shared_cache.setex(
+            self._shared_key(key), int(self.cache_ttl * self.STALE_FACTOR), payload
+        )
+    
+    def _cache_put(self, key: Tuple[float, float], points: ForecastSeries):
+        """Store points for key, evicting the least recently used entries past the size cap"""
+        self.cache[key] = (time.monotonic(), points, False)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.CACHE_MAX_ENTRIES:
+            self.cache.popitem(last=False)
+    
+    def _standardize_response(self, raw_data: Dict, latitude: float, longitude: float) -> ForecastSeries:
+        """Convert source-specific format to a standardized ForecastSeries"""
         raise NotImplementedError
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared client, created on first use so keep-alive connections are reused"""
+        if self._client is None:
+            # HTTP/2 multiplexes concurrent requests to one host over a single connection
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=5.0,
+                headers=self.headers,
+                limits=httpx.Limits(max_keepalive_connections=32),
+            )
+        return self._client
+    
+    async def shutdown(self):
+        """Release any network resources held by the source"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 class OpenMeteoSource(WeatherSource):
     """Open-Meteo API (free, multiple models)"""
     
+    # Only the variables _parse_openmeteo_response reads
+    HOURLY_VARIABLES = (
+        "temperature_2m,precipitation,rain,snowfall,pressure_msl"
+        ",cloud_cover,wind_speed_10m,wind_direction_10m,relative_humidity_2m"
+    )
+    
     def __init__(self):
         super().__init__("openmeteo", cache_ttl=300)
         self.base_url = "https://api.open-meteo.com/v1/forecast"
         self.models = ["gfs", "ecmwf", "gem"]  # GFS, ECMWF, Canadian model
     
-    async def get_forecast(self, latitude: float, longitude: float) -> List[ForecastPoint]:
-        """Get forecast from Open-Meteo"""
-        forecasts = []
+    async def _fetch_forecast(self, latitude: float, longitude: float) -> ForecastSeries:
+        """Get forecast from Open-Meteo, all models in one request"""
+        url = f"{self.base_url}?latitude={latitude}&longitude={longitude}"
+        url += f"&hourly={self.HOURLY_VARIABLES}"
+        url += f"&models={','.join(self.models)}&forecast_days=3"
         
-        # Try each model
-        for model in self.models:
-            try:
-                url = f"{self.base_url}?latitude={latitude}&longitude={longitude}"
-                url += f"&hourly=temperature_2m,precipitation,rain,showers,snowfall,pressure_msl"
-                url += f",cloud_cover,wind_speed_10m,wind_direction_10m,relative_humidity_2m"
-                url += f"&models={model}&forecast_days=3"
-                
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(url)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    # Extract forecast points
-                    points = self._parse_openmeteo_response(data, model, latitude, longitude)
-                    forecasts.extend(points)
-                    
-                    logger.info(f"Open-Meteo {model}: Got {len(points)} forecast points")
-                    
-            except Exception as e:
-                logger.warning(f"Open-Meteo {model} failed: {e}")
-                continue
+        response = await self._get_client().get(url)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
         
-        return forecasts
+        # Extract forecast points
+        points = self._parse_openmeteo_response(data, latitude, longitude)
+        logger.info(f"Open-Meteo: Got {len(points)} forecast points from {len(self.models)} models")
+        return points
     
-    def _parse_openmeteo_response(self, data: Dict, model: str, 
-                                 latitude: float, longitude: float) -> List[ForecastPoint]:
-        """Parse Open-Meteo API response"""
-        points = []
-        
+    def _parse_openmeteo_response(self, data: Dict,
+                                 latitude: float, longitude: float) -> ForecastSeries:
+        """Parse Open-Meteo API response into one series row per model and hour"""
         if "hourly" not in data:
-            return points
+            return ForecastSeries.empty(latitude, longitude)
         
         hourly = data["hourly"]
         time_list = hourly.get("time", [])
+        n = len(time_list)
+        if n == 0:
+            return ForecastSeries.empty(latitude, longitude)
         
-        # Extract all available variables
-        temp_list = hourly.get("temperature_2m", [])
-        precip_list = hourly.get("precipitation", [])
-        rain_list = hourly.get("rain", [])
-        snow_list = hourly.get("snowfall", [])
-        pressure_list = hourly.get("pressure_msl", [])
-        cloud_list = hourly.get("cloud_cover", [])
-        wind_speed_list = hourly.get("wind_speed_10m", [])
-        wind_dir_list = hourly.get("wind_direction_10m", [])
-        humidity_list = hourly.get("relative_humidity_2m", [])
+        try:
+            # One bulk parse instead of fromisoformat per row
+            timestamps = np.char.rstrip(np.asarray(time_list, dtype=str), "Z").astype("datetime64[s]")
+        except ValueError as e:
+            logger.warning(f"Error parsing Open-Meteo timestamps: {e}")
+            return ForecastSeries.empty(latitude, longitude)
         
-        # Combine rain and snow for total precipitation
-        def get_precipitation(i):
-            rain = rain_list[i] if i < len(rain_list) else 0
-            snow = snow_list[i] if i < len(snow_list) else 0
-            precip = precip_list[i] if i < len(precip_list) else 0
-            return max(rain + snow, precip)  # Use max of total or precipitation
+        # With several models each variable comes back once per model, suffixed
+        # with the model name (temperature_2m_gfs, ...)
+        suffixes = {model: f"_{model}" for model in self.models} if len(self.models) > 1 else {self.models[0]: ""}
         
-        for i, time_str in enumerate(time_list):
-            try:
-                timestamp = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
-                
-                point = ForecastPoint(
-                    timestamp=timestamp,
-                    temperature_c=temp_list[i] if i < len(temp_list) else None,
-                    precipitation_mm=get_precipitation(i),
-                    precipitation_probability=None,  # Open-Meteo doesn't provide probability
-                    wind_speed_mps=wind_speed_list[i] if i < len(wind_speed_list) else None,
-                    wind_direction_deg=wind_dir_list[i] if i < len(wind_dir_list) else None,
-                    humidity_percent=humidity_list[i] if i < len(humidity_list) else None,
-                    cloud_cover_percent=cloud_list[i] if i < len(cloud_list) else None,
-                    pressure_hpa=pressure_list[i] if i < len(pressure_list) else None,
-                    source=f"openmeteo_{model}",
-                    latitude=latitude,
-                    longitude=longitude
-                )
-                points.append(point)
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Error parsing Open-Meteo point {i}: {e}")
+        series = []
+        for model, suffix in suffixes.items():
+            if not any(f"{name}{suffix}" in hourly for name in self.HOURLY_VARIABLES.split(",")):
+                logger.warning(f"Open-Meteo {model}: no data in response")
                 continue
+            
+            # Extract all available variables as float columns (NaN where missing)
+            def column(name: str) -> np.ndarray:
+                values = np.full(n, np.nan, dtype=SERIES_DTYPE)
+                raw = np.asarray(hourly.get(f"{name}{suffix}", [])[:n], dtype=SERIES_DTYPE)
+                values[:len(raw)] = raw
+                return values
+            
+            # Combine rain and snow for total precipitation; use max of total or precipitation
+            precipitation = np.maximum(
+                np.nan_to_num(column("rain")) + np.nan_to_num(column("snowfall")),
+                np.nan_to_num(column("precipitation")),
+            )
+            
+            series.append(ForecastSeries.from_columns(
+                timestamps,
+                f"openmeteo_{model}",
+                latitude,
+                longitude,
+                temperature_c=column("temperature_2m"),
+                precipitation_mm=precipitation,
+                # Open-Meteo doesn't provide precipitation probability
+                wind_speed_mps=column("wind_speed_10m"),
+                wind_direction_deg=column("wind_direction_10m"),
+                humidity_percent=column("relative_humidity_2m"),
+                cloud_cover_percent=column("cloud_cover"),
+                pressure_hpa=column("pressure_msl"),
+            ))
         
-        return points
+        if not series:
+            return ForecastSeries.empty(latitude, longitude)
+        return ForecastSeries.concat(series)
 
 
 class NOAAWeatherGovSource(WeatherSource):
     """NOAA Weather.gov API (free, US only)"""
     
+    # A location's grid point (and so its forecast URL) effectively never changes
+    GRIDPOINT_TTL = 24 * 3600  # seconds
+    
     def __init__(self):
         super().__init__("noaa_weathergov", cache_ttl=600)
         self.base_url = "https://api.weather.gov"
         self.user_agent = "OneWeather/1.0 (https://github.com/nickconley23-arch/OneWeather)"
+        self.headers = {"User-Agent": self.user_agent}
     
-    async def get_forecast(self, latitude: float, longitude: float) -> List[ForecastPoint]:
+    async def _fetch_forecast(self, latitude: float, longitude: float) -> ForecastSeries:
         """Get forecast from NOAA Weather.gov"""
         try:
-            # First, get grid point
-            points_url = f"{self.base_url}/points/{latitude},{longitude}"
+            # Round like the /points API so nearby requests share a lookup
+            forecast_url = await self._resolve_gridpoint(round(latitude, 4), round(longitude, 4))
             
-            async with httpx.AsyncClient(
-                timeout=30.0,
-                headers={"User-Agent": self.user_agent}
-            ) as client:
-                # Get grid point
-                points_response = await client.get(points_url)
-                points_response.raise_for_status()
-                points_data = points_response.json()
-                
-                # Get forecast from grid point
-                forecast_url = points_data["properties"]["forecastHourly"]
-                forecast_response = await client.get(forecast_url)
-                forecast_response.raise_for_status()
-                forecast_data = forecast_response.json()
-                
-                # Parse forecast
-                points = self._parse_weathergov_response(forecast_data, latitude, longitude)
-                logger.info(f"Weather.gov: Got {len(points)} forecast points")
-                return points
+            # Get forecast from grid point
+            forecast_response = await self._get_client().get(forecast_url)
+            forecast_response.raise_for_status()
+            forecast_data = orjson.loads(forecast_response.content)
+            
+            # Parse forecast
+            points = self._parse_weathergov_response(forecast_data, latitude, longitude)
+            logger.info(f"Weather.gov: Got {len(points)} forecast points")
+            return points
                 
         except Exception as e:
             logger.warning(f"Weather.gov failed: {e}")
-            return []
+            raise
+    
+    @async_ttl_cache(ttl_seconds=GRIDPOINT_TTL)
+    async def _resolve_gridpoint(self, latitude: float, longitude: float) -> str:
+        """Hourly forecast URL for a location, cached for GRIDPOINT_TTL"""
+        points_response = await self._get_client().get(f"{self.base_url}/points/{latitude},{longitude}")
+        points_response.raise_for_status()
+        return orjson.loads(points_response.content)["properties"]["forecastHourly"]
     
     def _parse_weathergov_response(self, data: Dict, 
-                                  latitude: float, longitude: float) -> List[ForecastPoint]:
+                                  latitude: float, longitude: float) -> ForecastSeries:
         """Parse Weather.gov API response"""
-        points = []
-        
         if "properties" not in data or "periods" not in data["properties"]:
-            return points
+            return ForecastSeries.empty(latitude, longitude)
         
         periods = data["properties"]["periods"]
         
-        for period in periods:
-            try:
-                timestamp = datetime.fromisoformat(period["startTime"].replace("Z", "+00:00"))
-                
-                # Parse temperature (convert F to C if needed)
-                temp_f = period.get("temperature")
-                temperature_c = (temp_f - 32) * 5/9 if temp_f is not None else None
-                
-                # Parse wind speed (convert mph to m/s if needed)
-                wind_speed_str = period.get("windSpeed", "")
-                wind_speed_mps = self._parse_wind_speed(wind_speed_str)
-                
-                # Parse precipitation probability
-                precip_prob = period.get("probabilityOfPrecipitation", {}).get("value")
-                precipitation_probability = float(precip_prob) / 100 if precip_prob is not None else None
-                
-                point = ForecastPoint(
-                    timestamp=timestamp,
-                    temperature_c=temperature_c,
-                    precipitation_mm=None,  # Weather.gov doesn't provide amount
-                    precipitation_probability=precipitation_probability,
-                    wind_speed_mps=wind_speed_mps,
-                    wind_direction_deg=None,  # Would need to parse wind direction string
-                    humidity_percent=None,  # Not in hourly forecast
-                    cloud_cover_percent=None,  # Not in hourly forecast
-                    pressure_hpa=None,  # Not in hourly forecast
-                    source="noaa_weathergov",
-                    latitude=latitude,
-                    longitude=longitude
-                )
-                points.append(point)
-            except (ValueError, KeyError) as e:
-                logger.warning(f"Error parsing Weather.gov period: {e}")
-                continue
+        try:
+            # One bulk parse; offsets are applied so timestamps are naive UTC, like Open-Meteo's
+            timestamps = (
+                pd.to_datetime([period["startTime"] for period in periods], utc=True, format="ISO8601")
+                .tz_convert(None)
+                .to_numpy(dtype="datetime64[s]")
+            )
+            
+            # Parse temperature (convert F to C)
+            temp_f = np.array([period.get("temperature") for period in periods], dtype=np.float64)
+            
+            # Parse wind speed (convert mph to m/s)
+            wind_speed_mps = np.array(
+                [self._parse_wind_speed(period.get("windSpeed", "")) for period in periods],
+                dtype=np.float64,
+            )
+            
+            # Parse precipitation probability
+            precip_prob = np.array(
+                [(period.get("probabilityOfPrecipitation") or {}).get("value") for period in periods],
+                dtype=np.float64,
+            )
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Error parsing Weather.gov periods: {e}")
+            return ForecastSeries.empty(latitude, longitude)
         
-        return points
+        # Weather.gov doesn't provide precipitation amount, wind direction (only
+        # as a string), humidity, cloud cover or pressure in the hourly forecast
+        return ForecastSeries.from_columns(
+            timestamps,
+            "noaa_weathergov",
+            latitude,
+            longitude,
+            temperature_c=(temp_f - 32) * 5/9,
+            precipitation_probability=precip_prob / 100,
+            wind_speed_mps=wind_speed_mps,
+        )
     
     def _parse_wind_speed(self, wind_speed_str: str) -> Optional[float]:
         """Parse wind speed string like '10 mph' or '5 to 10 mph'"""
-        try:
-            # Extract first number
-            import re
-            match = re.search(r'(\d+(?:\.\d+)?)', wind_speed_str)
-            if match:
-                mph = float(match.group(1))
-                # Convert mph to m/s
-                return mph * 0.44704
-        except:
-            pass
-        return None
+        if not wind_speed_str:
+            return None
+        # Extract first number and convert mph to m/s
+        match = _WIND_SPEED_RE.search(wind_speed_str)
+        return float(match.group(1)) * 0.44704 if match else None
 
 
 class WeatherAPISource(WeatherSource):
@@ -249,12 +551,12 @@ class WeatherAPISource(WeatherSource):
         self.base_url = "http://api.weatherapi.com/v1"
         # Note: Requires free API key from weatherapi.com
     
-    async def get_forecast(self, latitude: float, longitude: float) -> List[ForecastPoint]:
+    async def _fetch_forecast(self, latitude: float, longitude: float) -> ForecastSeries:
         """Get forecast from WeatherAPI.com"""
         # Placeholder - needs API key
         # Free tier: 1M calls/month, 3-day forecast
         logger.info("WeatherAPI.com requires free API key registration")
-        return []
+        return ForecastSeries.empty(latitude, longitude)
 
 
 class OpenWeatherMapSource(WeatherSource):
@@ -265,12 +567,12 @@ class OpenWeatherMapSource(WeatherSource):
         self.base_url = "https://api.openweathermap.org/data/2.5"
         # Note: Requires free API key from openweathermap.org
     
-    async def get_forecast(self, latitude: float, longitude: float) -> List[ForecastPoint]:
+    async def _fetch_forecast(self, latitude: float, longitude: float) -> ForecastSeries:
         """Get forecast from OpenWeatherMap"""
         # Placeholder - needs API key
         # Free tier: 1,000 calls/day, current weather + 5-day forecast
         logger.info("OpenWeatherMap requires free API key registration")
-        return []
+        return ForecastSeries.empty(latitude, longitude)
 
 
 class MeteomaticsFreeSource(WeatherSource):
@@ -281,10 +583,38 @@ class MeteomaticsFreeSource(WeatherSource):
         self.base_url = "https://api.meteomatics.com"
         # Note: Requires registration for free API key
     
-    async def get_forecast(self, latitude: float, longitude: float) -> List[ForecastPoint]:
+    async def _fetch_forecast(self, latitude: float, longitude: float) -> ForecastSeries:
         """Get forecast from Meteomatics (placeholder - needs API key)"""
         logger.info("Meteomatics requires API key registration")
-        return []
+        return ForecastSeries.empty(latitude, longitude)
+
+
+def _blend_soa_numpy(values: np.ndarray) -> np.ndarray:
+    """Mean over the member axis of a (member, timestamp, field) array, ignoring NaN"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN slices
+        return np.nanmean(values, axis=0)
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _blend_soa(values: np.ndarray) -> np.ndarray:
+        """Compiled equivalent of _blend_soa_numpy, in a single pass without temporaries"""
+        members, timestamps, fields = values.shape
+        out = np.empty((timestamps, fields), dtype=values.dtype)
+        for t in range(timestamps):
+            for f in range(fields):
+                total = 0.0
+                count = 0
+                for m in range(members):
+                    value = values[m, t, f]
+                    if not np.isnan(value):
+                        total += value
+                        count += 1
+                out[t, f] = total / count if count else np.nan
+        return out
+else:
+    _blend_soa = _blend_soa_numpy
 
 
 class WeatherSourceManager:
@@ -301,127 +631,106 @@ class WeatherSourceManager:
         
         # Track which sources are actually working (have API keys)
         self.active_sources = ["openmeteo", "noaa_weathergov"]
+        
+        # Share fetched forecasts across workers; each source still keeps its local cache
+        self.shared_cache = get_cache_backend(settings.REDIS_URL)
+        for source in self.sources.values():
+            source.shared_cache = self.shared_cache
+        
+        # Bound each source's latency and stop calling sources that keep failing
+        self.source_timeout = 5.0
+        self.breakers = {name: source.breaker for name, source in self.sources.items()}
     
-    async def get_all_forecasts(self, latitude: float, longitude: float) -> Dict[str, List[ForecastPoint]]:
+    async def shutdown(self):
+        """Close every source's HTTP client and the shared cache connection"""
+        await asyncio.gather(*(source.shutdown() for source in self.sources.values()))
+        if self.shared_cache is not None:
+            await self.shared_cache.close()
+    
+    async def get_all_forecasts(self, latitude: float, longitude: float) -> Dict[str, ForecastSeries]:
         """Get forecasts from all available sources"""
-        results = {}
+        results, = await self.get_all_forecasts_batch([(latitude, longitude)])
+        return results
+    
+    async def get_all_forecasts_batch(self, coords: List[Tuple[float, float]]) -> List[Dict[str, ForecastSeries]]:
+        """Get forecasts from all available sources for several locations at once
         
-        # Run all sources concurrently
-        tasks = []
-        for name, source in self.sources.items():
-            task = asyncio.create_task(
-                self._safe_get_forecast(source, latitude, longitude, name)
-            )
-            tasks.append((name, task))
+        Returns one {source name: series} dict per location, in the order given.
+        """
+        # Run every location x source pair concurrently under one shared deadline;
+        # total latency is the slowest pair, capped at source_timeout
+        # Only active sources are fanned out; the rest would just return nothing
+        active = {name: source for name, source in self.sources.items() if name in self.active_sources}
+        tasks = [
+            {
+                name: asyncio.create_task(source.get_forecast(latitude, longitude))
+                for name, source in active.items()
+            }
+            for latitude, longitude in coords
+        ]
+        all_tasks = [task for location_tasks in tasks for task in location_tasks.values()]
+        if not all_tasks:
+            return [{} for _ in coords]
+        _, pending = await asyncio.wait(all_tasks, timeout=self.source_timeout)
+        for task in pending:
+            task.cancel()
+        # Let cancellation finish (closing any open responses) before returning
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        # A slow or failing source contributes no points instead of failing the request
+        results = []
+        failed = set()
+        for (latitude, longitude), location_tasks in zip(coords, tasks):
+            location_results = {}
+            for name, task in location_tasks.items():
+                if task in pending:
+                    logger.warning(f"Source {name} timed out")
+                    failed.add(name)
+                    location_results[name] = ForecastSeries.empty(latitude, longitude)
+                elif task.exception() is not None:
+                    logger.warning(f"Source {name} failed: {task.exception()}")
+                    failed.add(name)
+                    location_results[name] = ForecastSeries.empty(latitude, longitude)
+                else:
+                    location_results[name] = task.result()
+            results.append(location_results)
         
-        # Collect results
-        for name, task in tasks:
-            try:
-                results[name] = await task
-            except Exception as e:
-                logger.error(f"Source {name} failed: {e}")
-                results[name] = []
+        # Count a slow or erroring source once per batch, not once per location
+        for name in failed:
+            self.breakers[name].record_failure()
         
         return results
     
-    async def _safe_get_forecast(self, source: WeatherSource, 
-                                latitude: float, longitude: float, 
-                                name: str) -> List[ForecastPoint]:
-        """Safely get forecast with timeout"""
-        try:
-            return await asyncio.wait_for(
-                source.get_forecast(latitude, longitude),
-                timeout=30.0
-            )
-        except asyncio.TimeoutError:
-            logger.warning(f"Source {name} timed out")
-            return []
-        except Exception as e:
-            logger.warning(f"Source {name} error: {e}")
-            return []
-    
-    def blend_forecasts(self, forecasts: Dict[str, List[ForecastPoint]]) -> List[ForecastPoint]:
+    def blend_forecasts(self, forecasts: Dict[str, ForecastSeries]) -> ForecastSeries:
         """Simple average blending of all forecasts"""
-        if not forecasts:
-            return []
+        members = [series for series in forecasts.values() if len(series)]
+        if not members:
+            # No rows, so the coordinates are never read
+            return ForecastSeries.empty(0.0, 0.0)
         
-        # Group by timestamp
-        from collections import defaultdict
-        timestamp_groups = defaultdict(list)
+        # Group rows by timestamp; np.unique also sorts the groups by time
+        combined = ForecastSeries.concat(members)
+        timestamps, first, groups = np.unique(
+            combined.timestamps, return_index=True, return_inverse=True
+        )
         
-        # Collect all points by timestamp
-        for source_name, points in forecasts.items():
-            for point in points:
-                key = point.timestamp.isoformat()
-                timestamp_groups[key].append((source_name, point))
+        # Lay rows out as (member, timestamp, field), one member per model/source,
+        # and average over members in a single nan-aware mean (NaN if none reported)
+        _, member = np.unique(combined.sources, return_inverse=True)
+        grid = np.full((member.max() + 1, len(timestamps), len(SERIES_FIELDS)), np.nan, dtype=SERIES_DTYPE)
+        grid[member, groups] = np.column_stack([getattr(combined, name) for name in SERIES_FIELDS])
+        means = _blend_soa(grid)
+        columns = {name: means[:, i] for i, name in enumerate(SERIES_FIELDS)}
         
-        # Average each timestamp
-        blended_points = []
-        for timestamp_str, source_points in timestamp_groups.items():
-            if len(source_points) < 1:
-                continue
-            
-            # Use first point as template
-            _, first_point = source_points[0]
-            timestamp = first_point.timestamp
-            latitude = first_point.latitude
-            longitude = first_point.longitude
-            
-            # Calculate averages
-            temp_sum = count = 0
-            precip_sum = precip_count = 0
-            precip_prob_sum = precip_prob_count = 0
-            wind_speed_sum = wind_speed_count = 0
-            humidity_sum = humidity_count = 0
-            cloud_sum = cloud_count = 0
-            pressure_sum = pressure_count = 0
-            
-            for source_name, point in source_points:
-                if point.temperature_c is not None:
-                    temp_sum += point.temperature_c
-                    count += 1
-                if point.precipitation_mm is not None:
-                    precip_sum += point.precipitation_mm
-                    precip_count += 1
-                if point.precipitation_probability is not None:
-                    precip_prob_sum += point.precipitation_probability
-                    precip_prob_count += 1
-                if point.wind_speed_mps is not None:
-                    wind_speed_sum += point.wind_speed_mps
-                    wind_speed_count += 1
-                if point.humidity_percent is not None:
-                    humidity_sum += point.humidity_percent
-                    humidity_count += 1
-                if point.cloud_cover_percent is not None:
-                    cloud_sum += point.cloud_cover_percent
-                    cloud_count += 1
-                if point.pressure_hpa is not None:
-                    pressure_sum += point.pressure_hpa
-                    pressure_count += 1
-            
-            # Create blended point
-            blended_point = ForecastPoint(
-                timestamp=timestamp,
-                temperature_c=temp_sum / count if count > 0 else None,
-                precipitation_mm=precip_sum / precip_count if precip_count > 0 else None,
-                precipitation_probability=precip_prob_sum / precip_prob_count if precip_prob_count > 0 else None,
-                wind_speed_mps=wind_speed_sum / wind_speed_count if wind_speed_count > 0 else None,
-                wind_direction_deg=first_point.wind_direction_deg,  # Can't average direction
-                humidity_percent=humidity_sum / humidity_count if humidity_count > 0 else None,
-                cloud_cover_percent=cloud_sum / cloud_count if cloud_count > 0 else None,
-                pressure_hpa=pressure_sum / pressure_count if pressure_count > 0 else None,
-                source="blended",
-                latitude=latitude,
-                longitude=longitude
-            )
-            
-            blended_points.append(blended_point)
+        # Can't average direction; keep the first source's value
+        columns["wind_direction_deg"] = combined.wind_direction_deg[first]
         
-        # Sort by timestamp
-        blended_points.sort(key=lambda x: x.timestamp)
+        blended = ForecastSeries.from_columns(
+            timestamps, "blended", combined.latitude, combined.longitude, **columns
+        )
         
-        logger.info(f"Blended {len(blended_points)} forecast points from {len(forecasts)} sources")
-        return blended_points
+        logger.info(f"Blended {len(blended)} forecast points from {len(forecasts)} sources")
+        return blended
 
 
 # Global instance
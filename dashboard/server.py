@@ -5,13 +5,15 @@ For testing only - will be integrated into 1news.co
 """
 
 import http.server
-import socketserver
 import os
 import webbrowser
 from datetime import datetime
 
 PORT = 8081
 DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# JS/CSS/images may be cached briefly; asset names aren't content-hashed,
+# so keep this short enough that edits still show up quickly
+ASSET_MAX_AGE = 300  # seconds
 
 class DashboardHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
@@ -25,9 +27,14 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
     def end_headers(self):
         # Add CORS headers for development
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
+        path = self.path.split('?', 1)[0]
+        if path.endswith('/') or path.endswith('.html'):
+            # Pages always come fresh so new asset references are picked up
+            self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+            self.send_header('Pragma', 'no-cache')
+            self.send_header('Expires', '0')
+        else:
+            self.send_header('Cache-Control', f'public, max-age={ASSET_MAX_AGE}')
         super().end_headers()
 
 def main():
@@ -48,7 +55,8 @@ def main():
     print("=" * 60)
     
     try:
-        with socketserver.TCPServer(("", PORT), DashboardHandler) as httpd:
+        # One thread per connection so parallel asset requests don't queue
+        with http.server.ThreadingHTTPServer(("", PORT), DashboardHandler) as httpd:
             # Try to open browser automatically
             try:
                 webbrowser.open(f"http://localhost:{PORT}")
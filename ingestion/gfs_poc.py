@@ -16,7 +16,7 @@ Features:
 Requirements:
 - wgrib2 command-line tool (for GRIB2 inspection)
 - requests library (for HTTP downloads)
-- Optional: cfgrib for Python GRIB2 parsing
+- Optional: eccodes for in-process GRIB2 parsing
 
 Usage:
     python gfs_poc.py --cycle 00 --date 2025-02-05 --forecast-hour 0
@@ -25,14 +25,22 @@ Usage:
 import os
 import sys
 import json
+import asyncio
 import hashlib
 import logging
 import argparse
+import mmap
+import queue
+import re
+import shutil
+import sqlite3
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party imports (install with pip install requests)
 try:
@@ -43,6 +51,12 @@ except ImportError:
     print("Error: requests library not installed. Run: pip install requests")
     sys.exit(1)
 
+# Optional: faster metadata (de)serialization, falls back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,19 +64,139 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'OneWeather/1.0 (https://github.com/yourusername/oneweather)'
+
+def dump_json(path: Path, obj) -> None:
+    """Write obj to path as indented JSON in a single write"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, default=str,
+                                      option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        path.write_text(json.dumps(obj, indent=2, default=str) + "\n")
+
+def load_json(path: Path):
+    """Read a JSON document written by dump_json"""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text())
+
+# One GRIB inventory line, as in .idx files and `wgrib2 -s` output:
+# msg:offset:d=YYYYMMDDHH:VAR:level:forecast:...
+_INVENTORY_RE = re.compile(r'^\d+:(\d+):d=\d+:([^:\n]+):([^:\n]+):', re.MULTILINE)
+# Grid dimensions printed by `wgrib2 -nxny`
+_NXNY_RE = re.compile(r'\((\d+) x (\d+)\)')
+
+def parse_idx(idx_text: str, variables: List[str]) -> List[Tuple[int, Optional[int]]]:
+    """
+    Byte ranges of the GRIB messages in a .idx inventory matching variables
+    
+    A selector matches a message by name ("TMP") or name and level
+    ("TMP:2 m above ground"). Adjacent messages are merged into one range.
+    
+    Returns:
+        Sorted (first, last) inclusive byte ranges; last is None for a
+        range that runs to the end of the file
+    """
+    records = [(int(m.group(1)), m.group(2), m.group(3))
+               for m in _INVENTORY_RE.finditer(idx_text)]
+    
+    wanted = set(variables)
+    ranges: List[List] = []
+    for i, (start, name, level) in enumerate(records):
+        if name not in wanted and f"{name}:{level}" not in wanted:
+            continue
+        end = records[i + 1][0] - 1 if i + 1 < len(records) else None
+        if ranges and ranges[-1][1] == start - 1:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+    return [(first, last) for first, last in ranges]
+
+def subset_tag(variables: Optional[List[str]]) -> str:
+    """
+    Short, filename-safe tag identifying a set of parse_idx selectors
+    
+    Empty for a full file. Selector order and duplicates don't matter.
+    """
+    if not variables:
+        return ""
+    selectors = "\n".join(sorted(set(variables)))
+    return hashlib.sha1(selectors.encode()).hexdigest()[:10]
+
+class BackgroundWriter:
+    """
+    Write chunks to a file from a worker thread
+    
+    Lets the caller keep reading from the network while earlier chunks
+    drain to disk. At most QUEUE_DEPTH chunks are buffered; a write error
+    is raised from the next write() or from leaving the context.
+    """
+    
+    QUEUE_DEPTH = 8
+    
+    def __init__(self, f):
+        self._f = f
+        self._queue = queue.Queue(maxsize=self.QUEUE_DEPTH)
+        self._error: Optional[OSError] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while (chunk := self._queue.get()) is not None:
+            # Keep draining after a failure so the producer never blocks
+            if self._error is None:
+                try:
+                    self._f.write(chunk)
+                except OSError as e:
+                    self._error = e
+    
+    def write(self, chunk: bytes):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(chunk)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None and exc_info[0] is None:
+            raise self._error
+        return False
+
+class RangeNotSupported(Exception):
+    """Server answered a Range request with the whole file"""
+
 class GFSIngestor:
     """GFS data ingestion proof-of-concept"""
     
-    def __init__(self, base_dir: str = "/home/ubuntu/OneWeather/data"):
+    # Files at least this large are fetched as parallel byte-range segments
+    RANGED_MIN_SIZE = 64 * 1024 * 1024
+    RANGE_SEGMENTS = 6
+    # Large reads keep per-chunk Python overhead negligible next to the I/O
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    PROGRESS_INTERVAL = 10 * 1024 * 1024  # bytes between progress log lines
+    # Recorded alongside each digest as metadata["checksum_alg"]
+    CHECKSUM_ALG = "sha256"
+    
+    # Compact the metadata index after this many ingests
+    VACUUM_EVERY = 1000
+    
+    def __init__(self, base_dir: str = "/home/ubuntu/OneWeather/data",
+                 json_sidecars: bool = False):
         """
         Initialize the GFS ingestor
         
         Args:
             base_dir: Base directory for data storage
+            json_sidecars: Also write a JSON metadata file per GRIB file
+                (useful for debugging; the SQLite index is authoritative)
         """
         self.base_dir = Path(base_dir)
         self.raw_dir = self.base_dir / "raw" / "gfs"
         self.metadata_dir = self.base_dir / "metadata" / "gfs"
+        self.json_sidecars = json_sidecars
         
         # Create directories if they don't exist
         self.raw_dir.mkdir(parents=True, exist_ok=True)
@@ -70,10 +204,17 @@ class GFSIngestor:
         
         # GFS data source configuration
         self.base_url = "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod"
+        # (date, cycle, resolution) -> URL up to the forecast hour
+        self._url_prefixes: Dict[Tuple[str, str, str], str] = {}
         
         # Configure HTTP session with retry logic
         self.session = self._create_session()
         
+        # Metadata index and GRIB metadata cache, opened on first use
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._ingests_since_vacuum = 0
+        
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry logic"""
         session = requests.Session()
@@ -83,11 +224,21 @@ class GFSIngestor:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "OPTIONS"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Enough pooled keep-alive connections for ranged segments and
+        # concurrent probes, so repeat requests skip the TCP+TLS handshake
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=32,
+            pool_maxsize=32,
+            pool_block=False
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         session.headers.update({
-            'User-Agent': 'OneWeather/1.0 (https://github.com/yourusername/oneweather)'
+            'User-Agent': USER_AGENT,
+            'Connection': 'keep-alive',
+            # GRIB2 is already compressed
+            'Accept-Encoding': 'identity'
         })
         return session
     
@@ -105,67 +256,285 @@ class GFSIngestor:
         Returns:
             Complete URL to download
         """
-        # Format forecast hour as 3-digit string
-        fhour = f"{forecast_hour:03d}"
+        # Everything but the 3-digit forecast hour is shared across a cycle
+        key = (date, cycle, resolution)
+        prefix = self._url_prefixes.get(key)
+        if prefix is None:
+            prefix = f"{self.base_url}/gfs.{date}/{cycle}/atmos/gfs.t{cycle}z.pgrb2.{resolution}.f"
+            self._url_prefixes[key] = prefix
         
-        # Construct filename
-        filename = f"gfs.t{cycle}z.pgrb2.{resolution}.f{fhour}"
-        
-        # Construct URL path
-        url = f"{self.base_url}/gfs.{date}/{cycle}/atmos/{filename}"
-        
-        return url
+        return f"{prefix}{forecast_hour:03d}"
     
-    def download_file(self, url: str, output_path: Path) -> bool:
+    def download_file(self, url: str, output_path: Path) -> Tuple[bool, Optional[str]]:
         """
         Download a file with progress tracking and validation
         
+        The SHA256 checksum is computed while streaming, so the file is
+        not read back from disk afterwards. Data goes to "<name>.part" and
+        is renamed into place once complete, so an interrupted download
+        never looks ingested; the next attempt resumes it with a Range
+        request if the server's ETag is unchanged.
+        
         Args:
             url: URL to download
             output_path: Path to save the file
             
         Returns:
-            True if download successful, False otherwise
+            Tuple of (success, SHA256 checksum or None on failure)
         """
+        part_path = output_path.with_name(output_path.name + ".part")
+        
         try:
             logger.info(f"Downloading {url}")
             
+            # Large files go faster as several concurrent segments when the
+            # server's per-connection bandwidth is the bottleneck
+            size, etag = self._ranged_size(url)
+            # A partial download of this same version is resumed below
+            # instead of being fetched again in segments
+            resumable = (etag is not None and part_path.exists()
+                         and self._download_etag(output_path) == etag)
+            if size and not resumable:
+                try:
+                    ok = self._download_ranged(url, part_path, size)
+                except RangeNotSupported:
+                    logger.info("Server ignored Range requests; using a single stream")
+                else:
+                    if not ok:
+                        part_path.unlink(missing_ok=True)
+                        return False, None
+                    os.replace(part_path, output_path)
+                    self._set_download_etag(output_path, etag)
+                    # Segments arrive out of order, so hash the assembled file
+                    return True, self.calculate_checksum(output_path)
+            
+            # Resume a previous partial download if it is still the same file
+            resume_from = part_path.stat().st_size if part_path.exists() else 0
+            validator = self._download_etag(output_path) if resume_from else None
+            headers = {'Range': f'bytes={resume_from}-', 'If-Range': validator} if validator else {}
+            
             # Stream the download to handle large files
-            response = self.session.get(url, stream=True, timeout=30)
+            response = self.session.get(url, headers=headers, stream=True, timeout=30)
+            if response.status_code == 416 and headers:
+                # A crash before the truncate below leaves a preallocated
+                # .part whose size is no resume offset; start over
+                logger.info(f"Cannot resume {part_path.name}; downloading from the start")
+                response.close()
+                part_path.unlink()
+                response = self.session.get(url, stream=True, timeout=30)
             response.raise_for_status()
             
-            # Get file size for progress tracking
+            # Bytes in this response, used to preallocate the file
             total_size = int(response.headers.get('content-length', 0))
             
-            # Download with progress
-            downloaded = 0
+            if response.status_code == 206:
+                logger.info(f"Resuming {part_path.name} at {resume_from/1024/1024:.1f}MB")
+                sha256_hash = self._hash_file(part_path)
+                downloaded = resume_from
+            else:
+                sha256_hash = hashlib.new(self.CHECKSUM_ALG)
+                downloaded = 0
+                self._set_download_etag(output_path, response.headers.get('ETag'))
+            
+            # Download with progress, hashing in the same pass
             start_time = time.time()
+            # Bytes left until the next progress line
+            next_log = self.PROGRESS_INTERVAL
             
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        # Log progress every 10MB
-                        if downloaded % (10 * 1024 * 1024) < 8192:
-                            elapsed = time.time() - start_time
-                            speed = downloaded / elapsed / 1024 / 1024  # MB/s
-                            logger.info(f"Downloaded {downloaded/1024/1024:.1f}MB "
-                                      f"({speed:.1f} MB/s)")
+            flags = os.O_WRONLY | os.O_CREAT | (0 if downloaded else os.O_TRUNC)
+            with os.fdopen(os.open(part_path, flags, 0o644), 'wb') as f:
+                try:
+                    f.seek(downloaded)
+                    self._preallocate(f.fileno(), downloaded, total_size)
+                    
+                    with BackgroundWriter(f) as writer:
+                        for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                            if chunk:
+                                writer.write(chunk)
+                                sha256_hash.update(chunk)
+                                size = len(chunk)
+                                downloaded += size
+                                next_log -= size
+                                
+                                # Log progress every 10MB
+                                if next_log <= 0:
+                                    next_log += self.PROGRESS_INTERVAL
+                                    elapsed = time.time() - start_time
+                                    speed = downloaded / elapsed / 1024 / 1024  # MB/s
+                                    logger.info(f"Downloaded {downloaded/1024/1024:.1f}MB "
+                                              f"({speed:.1f} MB/s)")
+                finally:
+                    # Drop reserved space past the data, so the file size is
+                    # also the offset to resume from
+                    f.truncate()
+            
+            os.replace(part_path, output_path)
             
             elapsed = time.time() - start_time
             logger.info(f"Download complete: {output_path.name} "
                        f"({downloaded/1024/1024:.1f}MB in {elapsed:.1f}s)")
             
-            return True
+            return True, sha256_hash.hexdigest()
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Download failed: {e}")
-            return False
+            return False, None
         except Exception as e:
             logger.error(f"Unexpected error during download: {e}")
+            return False, None
+    
+    def _unchanged_on_server(self, url: str, etag: str) -> bool:
+        """Whether the server still has the version with this ETag"""
+        try:
+            response = self.session.head(url, headers={'If-None-Match': etag},
+                                         timeout=30, allow_redirects=True)
+        except requests.exceptions.RequestException as e:
+            # Keep the local copy when the server can't be asked
+            logger.warning(f"Could not revalidate {url}: {e}")
+            return True
+        return response.status_code == 304
+    
+    def download_subset(self, url: str, output_path: Path,
+                        variables: List[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Download only the GRIB messages for the given variables
+        
+        Reads the .idx inventory published next to each GFS file and fetches
+        the matching messages with Range requests. GRIB messages are
+        self-describing, so their concatenation is a valid GRIB2 file. As
+        with download_file, data goes to "<name>.part" and is renamed into
+        place once complete.
+        
+        Args:
+            url: URL of the full GRIB2 file
+            output_path: Path to save the subset
+            variables: Selectors as accepted by parse_idx
+            
+        Returns:
+            Tuple of (success, SHA256 checksum of the subset or None on failure)
+        """
+        part_path = output_path.with_name(output_path.name + ".part")
+        
+        try:
+            response = self.session.get(url + ".idx", timeout=30)
+            response.raise_for_status()
+            ranges = parse_idx(response.text, variables)
+            if not ranges:
+                logger.error(f"None of {variables} found in {url}.idx")
+                return False, None
+            
+            logger.info(f"Downloading {len(ranges)} byte ranges of {url}")
+            downloaded = 0
+            start_time = time.time()
+            sha256_hash = hashlib.new(self.CHECKSUM_ALG)
+            
+            with open(part_path, 'wb') as f:
+                for first, last in ranges:
+                    byte_range = f"bytes={first}-{'' if last is None else last}"
+                    response = self.session.get(url, headers={'Range': byte_range},
+                                                stream=True, timeout=30)
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        response.close()
+                        raise RangeNotSupported(url)
+                    for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        sha256_hash.update(chunk)
+                        downloaded += len(chunk)
+            
+            os.replace(part_path, output_path)
+            
+            elapsed = time.time() - start_time
+            logger.info(f"Download complete: {output_path.name} "
+                       f"({downloaded/1024/1024:.1f}MB in {elapsed:.1f}s)")
+            return True, sha256_hash.hexdigest()
+            
+        except (requests.exceptions.RequestException, RangeNotSupported) as e:
+            logger.error(f"Subset download failed: {e}")
+            return False, None
+        finally:
+            # Only a complete subset is renamed into place
+            part_path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _preallocate(fd: int, offset: int, length: int):
+        """
+        Reserve disk blocks for length bytes at offset and hint sequential access
+        
+        Allocating up front keeps a large file in contiguous extents instead
+        of growing it chunk by chunk. Both calls are best effort.
+        """
+        try:
+            if length > 0 and hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, offset, length)
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError as e:
+            logger.debug(f"Preallocation not supported: {e}")
+    
+    def _ranged_size(self, url: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        File size if the URL should be downloaded in byte-range segments
+        
+        Returns:
+            Tuple of (size, ETag); size is None when the server doesn't
+            advertise byte ranges or the file is below RANGED_MIN_SIZE
+        """
+        response = self.session.head(url, timeout=30, allow_redirects=True)
+        if response.status_code != 200:
+            return None, None
+        etag = response.headers.get('etag')
+        if response.headers.get('accept-ranges', '').lower() != 'bytes':
+            return None, etag
+        size = int(response.headers.get('content-length', 0))
+        return (size if size >= self.RANGED_MIN_SIZE else None), etag
+    
+    def _download_ranged(self, url: str, output_path: Path, size: int) -> bool:
+        """
+        Download a file as RANGE_SEGMENTS concurrent byte ranges
+        
+        Each worker writes its segment at the right offset with pwrite.
+        Raises RangeNotSupported if the server returns 200 instead of 206.
+        """
+        segment = -(-size // self.RANGE_SEGMENTS)  # ceiling division
+        ranges = [(start, min(start + segment, size) - 1)
+                  for start in range(0, size, segment)]
+        start_time = time.time()
+        
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            self._preallocate(fd, 0, size)
+            
+            def fetch(byte_range: Tuple[int, int]) -> int:
+                first, last = byte_range
+                response = self.session.get(url, headers={'Range': f'bytes={first}-{last}'},
+                                            stream=True, timeout=30)
+                response.raise_for_status()
+                if response.status_code != 206:
+                    response.close()
+                    raise RangeNotSupported(url)
+                
+                offset = first
+                for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                    os.pwrite(fd, chunk, offset)
+                    offset += len(chunk)
+                logger.info(f"Segment {first}-{last} done ({(offset - first)/1024/1024:.1f}MB)")
+                return offset - first
+            
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                downloaded = sum(pool.map(fetch, ranges))
+        finally:
+            os.close(fd)
+        
+        if downloaded != size:
+            logger.error(f"Download incomplete: got {downloaded} of {size} bytes")
             return False
+        
+        elapsed = time.time() - start_time
+        logger.info(f"Download complete: {output_path.name} "
+                   f"({downloaded/1024/1024:.1f}MB in {elapsed:.1f}s, "
+                   f"{len(ranges)} segments)")
+        return True
     
     def calculate_checksum(self, file_path: Path) -> str:
         """
@@ -177,18 +546,197 @@ class GFSIngestor:
         Returns:
             SHA256 checksum as hex string
         """
-        sha256_hash = hashlib.sha256()
+        return self._hash_file(file_path).hexdigest()
+    
+    def calculate_checksums(self, paths: List[Path],
+                            max_workers: Optional[int] = None) -> Dict[Path, str]:
+        """
+        Calculate SHA256 checksums of several files in parallel
+        
+        Hashing a mapped file releases the GIL, so the threads really do
+        run on separate cores.
+        
+        Args:
+            paths: Files to hash
+            max_workers: Thread count (default: one per CPU)
+            
+        Returns:
+            Dictionary of path to SHA256 checksum
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return dict(zip(paths, executor.map(self.calculate_checksum, paths)))
+    
+    def verify_files(self, date: str) -> Dict[str, bool]:
+        """
+        Re-hash every indexed file for a date and compare with its recorded checksum
+        
+        Args:
+            date: Date in YYYYMMDD format
+            
+        Returns:
+            Dictionary of filename to whether the file exists and matches
+        """
+        with self._db_lock:
+            rows = self._metadata_db().execute(
+                "SELECT cycle, filename, checksum FROM files WHERE date = ?", (date,)
+            ).fetchall()
+        
+        expected = {self.raw_dir / date / f"{cycle}z" / filename: checksum
+                    for cycle, filename, checksum in rows}
+        actual = self.calculate_checksums([path for path in expected if path.exists()])
+        return {path.name: actual.get(path) == checksum
+                for path, checksum in expected.items()}
+    
+    def _hash_file(self, file_path: Path):
+        """CHECKSUM_ALG hash object fed with the file's contents"""
+        sha256_hash = hashlib.new(self.CHECKSUM_ALG)
         
         with open(file_path, "rb") as f:
-            # Read file in chunks to handle large files
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+            # Empty files cannot be mapped
+            if os.fstat(f.fileno()).st_size:
+                # Hash the whole mapping in one C call (GIL released) rather
+                # than looping over read() copies in Python
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        # Aggressive read-ahead; pages can be dropped once hashed
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    sha256_hash.update(mm)
+        
+        return sha256_hash
+    
+    def _metadata_db(self) -> sqlite3.Connection:
+        """SQLite database in the metadata directory, created on first use"""
+        if self._db is None:
+            # Shared by the ingest worker threads; access goes through _db_lock
+            self._db = sqlite3.connect(self.metadata_dir / "metadata.db",
+                                       check_same_thread=False)
+            # WAL: appends without rewriting the database, readers don't block
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS grib_metadata ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, metadata TEXT)"
+            )
+            # ETag of the latest download per path, for resuming and revalidation
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS downloads (path TEXT PRIMARY KEY, etag TEXT)"
+            )
+            # subset is subset_tag() of the selectors, "" for a full file
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "date TEXT, cycle TEXT, forecast_hour INTEGER, resolution TEXT, "
+                "subset TEXT NOT NULL DEFAULT '', "
+                "filename TEXT, file_size INTEGER, checksum TEXT, metadata TEXT, "
+                "PRIMARY KEY (date, cycle, forecast_hour, resolution, subset))"
+            )
+        return self._db
+    
+    def _cached_grib_metadata(self, grib_path: Path, stat: os.stat_result) -> Optional[Dict]:
+        """Previously extracted metadata, if the file is unchanged since"""
+        with self._db_lock:
+            row = self._metadata_db().execute(
+                "SELECT metadata FROM grib_metadata WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (str(grib_path), stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def _cache_grib_metadata(self, grib_path: Path, stat: os.stat_result, metadata: Dict):
+        with self._db_lock, self._metadata_db() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO grib_metadata VALUES (?, ?, ?, ?)",
+                (str(grib_path), stat.st_size, stat.st_mtime_ns,
+                 json.dumps(metadata, default=str)),
+            )
+    
+    def _eccodes_metadata(self, grib_path: Path) -> Dict:
+        """
+        Inventory and grid description by walking GRIB messages in-process
+        
+        Only message headers are read; no data values are decoded.
+        
+        Raises:
+            ImportError: if the eccodes bindings are not installed
+            ValueError: if the file holds no GRIB messages
+        """
+        import eccodes
+        
+        variables = {}
+        levels = {}
+        grid_info = {}
+        message_count = 0
+        with open(grib_path, 'rb') as f:
+            while (gid := eccodes.codes_grib_new_from_file(f)) is not None:
+                try:
+                    message_count += 1
+                    variables[eccodes.codes_get(gid, 'shortName')] = None
+                    level = (f"{eccodes.codes_get(gid, 'level')} "
+                             f"{eccodes.codes_get(gid, 'typeOfLevel')}")
+                    levels[level] = None
+                    if not grid_info:
+                        # Every GFS message shares one grid
+                        grid_info = {key: eccodes.codes_get(gid, key) for key in (
+                            'gridType', 'Ni', 'Nj',
+                            'latitudeOfFirstGridPointInDegrees',
+                            'longitudeOfFirstGridPointInDegrees',
+                            'latitudeOfLastGridPointInDegrees',
+                            'longitudeOfLastGridPointInDegrees',
+                        )}
+                finally:
+                    eccodes.codes_release(gid)
         
-        return sha256_hash.hexdigest()
+        if not message_count:
+            raise ValueError("no GRIB messages found")
+        
+        logger.info(f"Extracted metadata using eccodes: {len(variables)} variables")
+        return {
+            "message_count": message_count,
+            "variables": list(variables),
+            "levels": list(levels),
+            "grid_info": grid_info,
+        }
+    
+    def _wgrib2_metadata(self, grib_path: Path) -> Optional[Dict]:
+        """
+        Inventory and grid size from a single wgrib2 run
+        
+        Returns:
+            Partial metadata dictionary, or None if wgrib2 is unavailable or fails
+        """
+        if shutil.which("wgrib2") is None:
+            return None
+        
+        try:
+            # -s and -nxny print on one line per message, so one pass over
+            # the file yields both the inventory and the grid dimensions
+            result = subprocess.run(
+                ["wgrib2", str(grib_path), "-s", "-nxny"],
+                capture_output=True, text=True, check=True, timeout=300
+            )
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.warning(f"Error extracting GRIB metadata with wgrib2: {e}")
+            return None
+        
+        inventory = _INVENTORY_RE.findall(result.stdout)
+        if not inventory:
+            return None
+        
+        _, variables, levels = zip(*inventory)
+        grid = _NXNY_RE.search(result.stdout)
+        grid_info = {"nx": int(grid.group(1)), "ny": int(grid.group(2))} if grid else {}
+        
+        logger.info(f"Extracted metadata using wgrib2: {len(inventory)} messages")
+        return {
+            "message_count": len(inventory),
+            "variables": list(dict.fromkeys(variables)),
+            "levels": list(dict.fromkeys(levels)),
+            "grid_info": grid_info,
+        }
     
     def extract_grib_metadata(self, grib_path: Path) -> Dict:
         """
-        Extract basic metadata from GRIB2 file using cfgrib
+        Extract basic metadata from GRIB2 file using eccodes, falling back to wgrib2
+        
+        Results are cached in metadata.db keyed by file size and mtime, so
+        re-ingesting an unchanged file skips the extraction.
         
         Args:
             grib_path: Path to GRIB2 file
@@ -196,112 +744,147 @@ class GFSIngestor:
         Returns:
             Dictionary with metadata
         """
+        stat = grib_path.stat()
+        cached = self._cached_grib_metadata(grib_path, stat)
+        if cached is not None:
+            return cached
+        
         metadata = {
-            "file_size": grib_path.stat().st_size,
+            "file_size": stat.st_size,
             "variables": [],
             "levels": [],
             "grid_info": {}
         }
         
         try:
-            # Try to use cfgrib for metadata extraction
-            import cfgrib
-            
-            # Open the GRIB file and get metadata
-            datasets = cfgrib.open_datasets(str(grib_path))
-            
-            if datasets:
-                # Get metadata from first dataset
-                ds = datasets[0]
-                metadata["message_count"] = len(datasets)
-                
-                # Extract variables
-                if hasattr(ds, 'data_vars'):
-                    variables = list(ds.data_vars.keys())
-                    metadata["variables"] = variables
-                
-                # Extract dimensions
-                if hasattr(ds, 'dims'):
-                    metadata["dimensions"] = dict(ds.dims)
-                
-                # Extract grid information
-                if hasattr(ds, 'attrs'):
-                    metadata["grid_info"] = ds.attrs
-                
-                # Extract available levels
-                if 'heightAboveGround' in ds.coords:
-                    levels = ds.coords['heightAboveGround'].values.tolist()
-                    metadata["levels"] = levels
-                elif 'isobaricInhPa' in ds.coords:
-                    levels = ds.coords['isobaricInhPa'].values.tolist()
-                    metadata["levels"] = levels
-                    
-                logger.info(f"Extracted metadata using cfgrib: {len(variables)} variables")
-                
-        except ImportError:
-            logger.warning("cfgrib not installed. Install with: pip install cfgrib")
-            # Fallback: try to parse with basic file inspection
-            metadata["variables"] = ["unknown"]
-            metadata["levels"] = ["unknown"]
-            
+            metadata.update(self._eccodes_metadata(grib_path))
         except Exception as e:
-            logger.warning(f"Error extracting GRIB metadata with cfgrib: {e}")
-            # Fallback to basic file info
-            metadata["variables"] = ["unknown"]
-            metadata["levels"] = ["unknown"]
+            if isinstance(e, ImportError):
+                logger.warning("eccodes not installed. Install with: pip install eccodes")
+            else:
+                logger.warning(f"Error extracting GRIB metadata with eccodes: {e}")
+            
+            wgrib2_metadata = self._wgrib2_metadata(grib_path)
+            if wgrib2_metadata is None:
+                # Fallback to basic file info; not cached so a later run
+                # with the tools installed can fill it in
+                metadata["variables"] = ["unknown"]
+                metadata["levels"] = ["unknown"]
+                return metadata
+            metadata.update(wgrib2_metadata)
         
+        self._cache_grib_metadata(grib_path, stat, metadata)
         return metadata
     
-    def ingest_forecast(self, date: str, cycle: str, forecast_hour: int = 0,
-                       resolution: str = "0p25") -> Tuple[bool, Dict]:
+    def _download_etag(self, path: Path) -> Optional[str]:
+        with self._db_lock:
+            row = self._metadata_db().execute(
+                "SELECT etag FROM downloads WHERE path = ?", (str(path),)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def _set_download_etag(self, path: Path, etag: Optional[str]):
+        with self._db_lock, self._metadata_db() as db:
+            if etag:
+                db.execute("INSERT OR REPLACE INTO downloads VALUES (?, ?)", (str(path), etag))
+            else:
+                db.execute("DELETE FROM downloads WHERE path = ?", (str(path),))
+    
+    def _indexed_metadata(self, date: str, cycle: str, forecast_hour: int,
+                          resolution: str, subset: str = "") -> Optional[Dict]:
+        """Metadata recorded in the index for a forecast file, if any"""
+        with self._db_lock:
+            row = self._metadata_db().execute(
+                "SELECT metadata FROM files WHERE date = ? AND cycle = ? "
+                "AND forecast_hour = ? AND resolution = ? AND subset = ?",
+                (date, cycle, forecast_hour, resolution, subset),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def _record_ingest(self, metadata: Dict):
+        """Add or replace a forecast file's row in the index"""
+        with self._db_lock:
+            db = self._metadata_db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (metadata["date"], metadata["cycle"], metadata["forecast_hour"],
+                     metadata["resolution"], subset_tag(metadata.get("subset_variables")),
+                     metadata["filename"], metadata["file_size"],
+                     metadata["checksum_sha256"], json.dumps(metadata, default=str)),
+                )
+            
+            # Replaced rows leave free pages behind; reclaim them now and then
+            self._ingests_since_vacuum += 1
+            if self._ingests_since_vacuum >= self.VACUUM_EVERY:
+                db.execute("VACUUM")
+                self._ingests_since_vacuum = 0
+    
+    def _cycle_indexed(self, date: str, cycle: str) -> bool:
+        with self._db_lock:
+            return self._metadata_db().execute(
+                "SELECT 1 FROM files WHERE date = ? AND cycle = ? LIMIT 1",
+                (date, cycle),
+            ).fetchone() is not None
+    
+    def _forecast_paths(self, date: str, cycle: str, forecast_hour: int,
+                        resolution: str,
+                        variables: Optional[List[str]] = None) -> Tuple[str, Path, Path]:
         """
-        Ingest a single GFS forecast file
+        Filename, raw file path and JSON sidecar path for a forecast file
         
-        Args:
-            date: Date in YYYYMMDD format
-            cycle: Model cycle (00, 06, 12, 18)
-            forecast_hour: Forecast hour (0-384)
-            resolution: Grid resolution
-            
-        Returns:
-            Tuple of (success, metadata)
+        A subset (variables given) gets its own name, tagged with
+        subset_tag(variables), so it never stands in for the full file.
+        Creates the parent directory of the raw file, and of the sidecar
+        when sidecars are enabled.
         """
-        # Construct paths
         date_dir = self.raw_dir / date / f"{cycle}z"
         date_dir.mkdir(parents=True, exist_ok=True)
         
         fhour = f"{forecast_hour:03d}"
         filename = f"gfs.t{cycle}z.pgrb2.{resolution}.f{fhour}"
+        if variables:
+            filename += f".subset-{subset_tag(variables)}"
         file_path = date_dir / filename
         
         metadata_path = self.metadata_dir / date / f"{cycle}z" / f"{filename}.json"
-        metadata_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Check if file already exists
-        if file_path.exists():
-            logger.info(f"File already exists: {file_path}")
-            
-            # Load existing metadata
-            if metadata_path.exists():
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
-                return True, metadata
-            else:
-                # Extract metadata from existing file
-                metadata = self.extract_grib_metadata(file_path)
-                return True, metadata
-        
-        # Construct URL
-        url = self.construct_url(date, cycle, forecast_hour, resolution)
+        if self.json_sidecars:
+            metadata_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Download file
-        success = self.download_file(url, file_path)
+        return filename, file_path, metadata_path
+    
+    def _existing_metadata(self, date: str, cycle: str, forecast_hour: int,
+                           resolution: str, file_path: Path,
+                           metadata_path: Path,
+                           variables: Optional[List[str]] = None) -> Dict:
+        """Metadata for a file that was already ingested"""
+        logger.info(f"File already exists: {file_path}")
         
-        if not success:
-            return False, {}
+        # Load existing metadata
+        metadata = self._indexed_metadata(date, cycle, forecast_hour, resolution,
+                                          subset_tag(variables))
+        if metadata is not None:
+            return metadata
+        if metadata_path.exists():
+            return load_json(metadata_path)
         
-        # Calculate checksum
-        checksum = self.calculate_checksum(file_path)
+        # Extract metadata from existing file
+        return self.extract_grib_metadata(file_path)
+    
+    @staticmethod
+    def _same_subset(metadata: Dict, variables: Optional[List[str]]) -> bool:
+        """Whether an existing file holds exactly the requested messages"""
+        return subset_tag(metadata.get("subset_variables")) == subset_tag(variables)
+    
+    def _finalize_ingest(self, date: str, cycle: str, forecast_hour: int,
+                         resolution: str, filename: str, file_path: Path,
+                         metadata_path: Path, url: str,
+                         checksum: Optional[str] = None,
+                         variables: Optional[List[str]] = None) -> Tuple[bool, Dict]:
+        """Inspect and record metadata for a downloaded file"""
+        # Checksum is normally computed during the download
+        if checksum is None:
+            checksum = self.calculate_checksum(file_path)
         
         # Extract metadata
         grib_metadata = self.extract_grib_metadata(file_path)
@@ -317,14 +900,19 @@ class GFSIngestor:
             "download_time": datetime.utcnow().isoformat() + "Z",
             "file_size": file_path.stat().st_size,
             "checksum_sha256": checksum,
+            "checksum_alg": self.CHECKSUM_ALG,
+            "etag": self._download_etag(file_path),
             "url": url,
+            # None for a full file, else the selectors it was subset to
+            "subset_variables": variables,
             "grib_metadata": grib_metadata,
             "status": "ingested"
         }
         
         # Save metadata
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        self._record_ingest(metadata)
+        if self.json_sidecars:
+            dump_json(metadata_path, metadata)
         
         logger.info(f"Ingestion complete: {filename}")
         logger.info(f"  Size: {metadata['file_size'] / 1024 / 1024:.1f}MB")
@@ -332,6 +920,183 @@ class GFSIngestor:
         
         return True, metadata
     
+    def ingest_forecast(self, date: str, cycle: str, forecast_hour: int = 0,
+                       resolution: str = "0p25",
+                       variables: Optional[List[str]] = None,
+                       revalidate: bool = False) -> Tuple[bool, Dict]:
+        """
+        Ingest a single GFS forecast file
+        
+        Args:
+            date: Date in YYYYMMDD format
+            cycle: Model cycle (00, 06, 12, 18)
+            forecast_hour: Forecast hour (0-384)
+            resolution: Grid resolution
+            variables: Only download these messages (see parse_idx);
+                default is the whole file
+            revalidate: For an existing file, ask the server (If-None-Match)
+                whether it changed and download it again if so
+            
+        Returns:
+            Tuple of (success, metadata)
+        """
+        filename, file_path, metadata_path = self._forecast_paths(
+            date, cycle, forecast_hour, resolution, variables)
+        
+        # Construct URL
+        url = self.construct_url(date, cycle, forecast_hour, resolution)
+        
+        # Check if file already exists
+        if file_path.exists():
+            metadata = self._existing_metadata(date, cycle, forecast_hour, resolution,
+                                               file_path, metadata_path, variables)
+            etag = metadata.get("etag")
+            if not self._same_subset(metadata, variables):
+                logger.info(f"{filename} holds different messages; downloading again")
+            elif not (revalidate and etag) or self._unchanged_on_server(url, etag):
+                return True, metadata
+            else:
+                logger.info(f"{filename} changed on the server; downloading again")
+        
+        # Download file
+        if variables:
+            success, checksum = self.download_subset(url, file_path, variables)
+        else:
+            success, checksum = self.download_file(url, file_path)
+        
+        if not success:
+            return False, {}
+        
+        return self._finalize_ingest(date, cycle, forecast_hour, resolution,
+                                     filename, file_path, metadata_path, url,
+                                     checksum, variables)
+    
+    async def ingest_forecasts(self, specs: List[Tuple], 
+                               concurrency: int = 8) -> List[Tuple[bool, Dict]]:
+        """
+        Ingest several GFS forecast files concurrently
+        
+        Downloads share one aiohttp connection pool, with at most
+        `concurrency` transfers in flight at once.
+        
+        Args:
+            specs: (date, cycle, forecast_hour[, resolution]) tuples
+            concurrency: Maximum simultaneous downloads
+            
+        Returns:
+            List of (success, metadata) tuples, in the order of specs
+        """
+        try:
+            import aiohttp
+            import aiofiles
+        except ImportError:
+            logger.error("aiohttp/aiofiles not installed. Install with: pip install aiohttp aiofiles")
+            return [(False, {}) for _ in specs]
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def download(session, url: str, output_path: Path) -> Optional[str]:
+            """
+            Stream url to output_path; returns its SHA256, or None on failure
+            
+            Like download_file, data goes to "<name>.part" and is renamed
+            into place once complete, and the ETag is recorded for --revalidate.
+            """
+            logger.info(f"Downloading {url}")
+            part_path = output_path.with_name(output_path.name + ".part")
+            downloaded = 0
+            start_time = time.time()
+            sha256_hash = hashlib.new(self.CHECKSUM_ALG)
+            
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    async with aiofiles.open(part_path, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(self.DOWNLOAD_CHUNK_SIZE):
+                            await f.write(chunk)
+                            sha256_hash.update(chunk)
+                            downloaded += len(chunk)
+                    etag = response.headers.get('ETag')
+                os.replace(part_path, output_path)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                logger.error(f"Download failed: {e}")
+                return None
+            finally:
+                # Don't leave a partial file behind, also when cancelled
+                part_path.unlink(missing_ok=True)
+            await asyncio.to_thread(self._set_download_etag, output_path, etag)
+            
+            elapsed = time.time() - start_time
+            logger.info(f"Download complete: {output_path.name} "
+                       f"({downloaded/1024/1024:.1f}MB in {elapsed:.1f}s)")
+            return sha256_hash.hexdigest()
+        
+        async def ingest_one(session, date: str, cycle: str, forecast_hour: int = 0,
+                             resolution: str = "0p25") -> Tuple[bool, Dict]:
+            filename, file_path, metadata_path = self._forecast_paths(
+                date, cycle, forecast_hour, resolution)
+            
+            if file_path.exists():
+                # May run eccodes or wgrib2; keep it off the event loop
+                metadata = await asyncio.to_thread(
+                    self._existing_metadata, date, cycle, forecast_hour,
+                    resolution, file_path, metadata_path)
+                if self._same_subset(metadata, None):
+                    return True, metadata
+                logger.info(f"{filename} holds a subset; downloading the full file")
+            
+            url = self.construct_url(date, cycle, forecast_hour, resolution)
+            async with semaphore:
+                checksum = await download(session, url, file_path)
+            if checksum is None:
+                return False, {}
+            
+            # GRIB inspection blocks; keep it off the event loop
+            return await asyncio.to_thread(
+                self._finalize_ingest, date, cycle, forecast_hour, resolution,
+                filename, file_path, metadata_path, url, checksum)
+        
+        connector = aiohttp.TCPConnector(limit=16, limit_per_host=concurrency,
+                                         keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(sock_connect=30, sock_read=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={'User-Agent': USER_AGENT}) as session:
+            results = await asyncio.gather(
+                *(ingest_one(session, *spec) for spec in specs),
+                return_exceptions=True
+            )
+        
+        outcomes = []
+        for spec, result in zip(specs, results):
+            if isinstance(result, Exception):
+                logger.error(f"Ingestion failed for {spec}: {result}")
+                result = (False, {})
+            outcomes.append(result)
+        return outcomes
+    
+    def _probe_cycle(self, date: str, cycle: str) -> Dict:
+        """Server and local availability of one cycle"""
+        # Check if cycle directory exists on server
+        url = f"{self.base_url}/gfs.{date}/{cycle}/"
+        
+        try:
+            response = self.session.head(url, timeout=10)
+            exists = response.status_code == 200
+        except requests.exceptions.RequestException:
+            exists = False
+        
+        # Check if we have data locally; the directory scan only matters
+        # for files ingested before the index existed
+        local_dir = self.raw_dir / date / f"{cycle}z"
+        local_exists = (self._cycle_indexed(date, cycle)
+                        or (local_dir.exists() and any(local_dir.iterdir())))
+        
+        return {
+            "available_on_server": exists,
+            "available_locally": local_exists,
+            "url": url
+        }
+    
     def list_available_cycles(self, date: str = None) -> Dict:
         """
         List available GFS cycles for a given date
@@ -345,28 +1110,14 @@ class GFSIngestor:
         if date is None:
             date = datetime.utcnow().strftime("%Y%m%d")
         
-        cycles = {}
         available_cycles = ["00", "06", "12", "18"]
         
-        for cycle in available_cycles:
-            # Check if cycle directory exists on server
-            url = f"{self.base_url}/gfs.{date}/{cycle}/"
-            
-            try:
-                response = self.session.head(url, timeout=10)
-                exists = response.status_code == 200
-            except:
-                exists = False
-            
-            # Check if we have data locally
-            local_dir = self.raw_dir / date / f"{cycle}z"
-            local_exists = local_dir.exists() and any(local_dir.iterdir())
-            
-            cycles[cycle] = {
-                "available_on_server": exists,
-                "available_locally": local_exists,
-                "url": url
-            }
+        # Each probe is one round trip plus a local directory check; run
+        # them together so listing costs about one RTT instead of four
+        with ThreadPoolExecutor(max_workers=len(available_cycles)) as executor:
+            probes = executor.map(lambda cycle: self._probe_cycle(date, cycle),
+                                  available_cycles)
+            cycles = dict(zip(available_cycles, probes))
         
         return cycles
 
@@ -380,6 +1131,10 @@ def main():
                        help="Model cycle (default: 00)")
     parser.add_argument("--forecast-hour", type=int, default=0,
                        help="Forecast hour (default: 0, analysis)")
+    parser.add_argument("--forecast-hours", type=str, default=None,
+                       help="Comma-separated forecast hours to download concurrently (e.g. 0,3,6)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                       help="Simultaneous downloads with --forecast-hours (default: 8)")
     parser.add_argument("--resolution", type=str, default="0p25",
                        choices=["0p25", "0p50", "1p00"],
                        help="Grid resolution (default: 0p25)")
@@ -388,6 +1143,15 @@ def main():
     parser.add_argument("--base-dir", type=str, 
                        default="/home/ubuntu/OneWeather/data",
                        help="Base directory for data storage")
+    parser.add_argument("--variables", type=str, default=None,
+                       help="Comma-separated messages to download, e.g. "
+                            "'TMP:2 m above ground,UGRD,VGRD' (default: whole file)")
+    parser.add_argument("--verify", action="store_true",
+                       help="Re-check the checksums of all files ingested for --date")
+    parser.add_argument("--revalidate", action="store_true",
+                       help="Re-download an existing file if it changed on the server")
+    parser.add_argument("--json-sidecars", action="store_true",
+                       help="Also write a JSON metadata file next to the index")
     
     args = parser.parse_args()
     
@@ -396,7 +1160,7 @@ def main():
         args.date = datetime.utcnow().strftime("%Y%m%d")
     
     # Initialize ingestor
-    ingestor = GFSIngestor(base_dir=args.base_dir)
+    ingestor = GFSIngestor(base_dir=args.base_dir, json_sidecars=args.json_sidecars)
     
     if args.list_cycles:
         # List available cycles
@@ -412,6 +1176,41 @@ def main():
         
         return
     
+    if args.verify:
+        print(f"Verifying checksums of files ingested for {args.date}...")
+        results = ingestor.verify_files(args.date)
+        
+        bad = [filename for filename, ok in results.items() if not ok]
+        for filename in bad:
+            print(f"❌ {filename}: missing or checksum mismatch")
+        print(f"\n{len(results) - len(bad)} of {len(results)} files verified")
+        if bad:
+            sys.exit(1)
+        return
+    
+    if args.forecast_hours:
+        # Ingest several forecast hours concurrently
+        hours = [int(h) for h in args.forecast_hours.split(",") if h.strip()]
+        print(f"Ingesting {len(hours)} GFS forecasts for {args.date} {args.cycle}Z "
+              f"({args.concurrency} at a time)")
+        print("-" * 60)
+        
+        specs = [(args.date, args.cycle, hour, args.resolution) for hour in hours]
+        results = asyncio.run(ingestor.ingest_forecasts(specs, concurrency=args.concurrency))
+        
+        failed = 0
+        for hour, (success, metadata) in zip(hours, results):
+            status = "✅" if success else "❌"
+            size = metadata.get('file_size', 0) / 1024 / 1024
+            print(f"{status} f{hour:03d}: {size:.1f} MB")
+            failed += not success
+        
+        if failed:
+            print(f"\n❌ {failed} of {len(hours)} ingestions failed!")
+            sys.exit(1)
+        print(f"\n✅ All {len(hours)} ingestions successful!")
+        return
+    
     # Ingest specified forecast
     print(f"Ingesting GFS forecast:")
     print(f"  Date: {args.date}")
@@ -424,7 +1223,9 @@ def main():
         date=args.date,
         cycle=args.cycle,
         forecast_hour=args.forecast_hour,
-        resolution=args.resolution
+        resolution=args.resolution,
+        variables=[v for v in args.variables.split(",") if v] if args.variables else None,
+        revalidate=args.revalidate
     )
     
     if success:
@@ -1,27 +1,33 @@
 #!/usr/bin/env python3
 """
-Test script for GFS ingestion proof-of-concept
+Tests for GFS ingestion proof-of-concept
 
-This script tests the basic functionality of the GFS ingestor
-without actually downloading large files.
+These test the basic functionality of the GFS ingestor without actually
+downloading large files. Run with: python -m pytest test_gfs_poc.py
 """
 
 import os
 import sys
 import json
-import tempfile
-from pathlib import Path
+import asyncio
+import contextlib
+import hashlib
 from unittest.mock import Mock, patch
 
+import pytest
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gfs_poc import GFSIngestor
+from gfs_poc import GFSIngestor, dump_json, load_json, parse_idx
+
+@pytest.fixture
+def ingestor(tmp_path):
+    """Ingestor storing data under a fresh temporary directory"""
+    return GFSIngestor(base_dir=str(tmp_path))
 
-def test_url_construction():
+def test_url_construction(ingestor):
     """Test URL construction logic"""
-    ingestor = GFSIngestor(base_dir="/tmp/test")
-    
     # Test basic URL construction
     url = ingestor.construct_url("20250205", "00", 0, "0p25")
     expected = "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod/gfs.20250205/00/atmos/gfs.t00z.pgrb2.0p25.f000"
@@ -31,68 +37,48 @@ def test_url_construction():
     url = ingestor.construct_url("20250205", "12", 24, "0p50")
     expected = "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod/gfs.20250205/12/atmos/gfs.t12z.pgrb2.0p50.f024"
     assert url == expected, f"URL mismatch: {url}"
-    
-    print("✅ URL construction tests passed")
 
-def test_directory_structure():
+def test_directory_structure(ingestor, tmp_path):
     """Test directory creation"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        ingestor = GFSIngestor(base_dir=tmpdir)
-        
-        # Check that directories were created
-        assert (Path(tmpdir) / "raw" / "gfs").exists()
-        assert (Path(tmpdir) / "metadata" / "gfs").exists()
-        
-        print("✅ Directory structure tests passed")
+    # Check that directories were created
+    assert (tmp_path / "raw" / "gfs").exists()
+    assert (tmp_path / "metadata" / "gfs").exists()
 
-def test_checksum_calculation():
+def test_checksum_calculation(ingestor, tmp_path):
     """Test checksum calculation"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        ingestor = GFSIngestor(base_dir=tmpdir)
-        
-        # Create a test file
-        test_file = Path(tmpdir) / "test.txt"
-        test_file.write_text("Hello, World!")
-        
-        # Calculate checksum
-        checksum = ingestor.calculate_checksum(test_file)
-        
-        # Expected SHA256 of "Hello, World!"
-        expected = "dffd6021bb2bd5b0af676290809ec3a53191dd81c7f70a4b28688a362182986f"
-        assert checksum == expected, f"Checksum mismatch: {checksum}"
-        
-        print("✅ Checksum calculation tests passed")
+    # Create a test file
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("Hello, World!")
+    
+    # Calculate checksum
+    checksum = ingestor.calculate_checksum(test_file)
+    
+    # Expected SHA256 of "Hello, World!"
+    expected = "dffd6021bb2bd5b0af676290809ec3a53191dd81c7f70a4b28688a362182986f"
+    assert checksum == expected, f"Checksum mismatch: {checksum}"
 
-def test_metadata_storage():
+def test_metadata_storage(ingestor, tmp_path):
     """Test metadata JSON storage"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        ingestor = GFSIngestor(base_dir=tmpdir)
-        
-        # Create test metadata
-        test_metadata = {
-            "source": "gfs",
-            "date": "20250205",
-            "cycle": "00",
-            "status": "test"
-        }
-        
-        # Save metadata
-        metadata_path = Path(tmpdir) / "metadata" / "gfs" / "test.json"
-        metadata_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(metadata_path, 'w') as f:
-            json.dump(test_metadata, f)
-        
-        # Load and verify
-        with open(metadata_path, 'r') as f:
-            loaded_metadata = json.load(f)
-        
-        assert loaded_metadata == test_metadata, "Metadata mismatch"
-        
-        print("✅ Metadata storage tests passed")
+    # Create test metadata
+    test_metadata = {
+        "source": "gfs",
+        "date": "20250205",
+        "cycle": "00",
+        "status": "test"
+    }
+    
+    # Save metadata
+    metadata_path = tmp_path / "metadata" / "gfs" / "test.json"
+    metadata_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    dump_json(metadata_path, test_metadata)
+    
+    # Load and verify
+    loaded_metadata = load_json(metadata_path)
+    
+    assert loaded_metadata == test_metadata, "Metadata mismatch"
 
-@patch('gfs_poc.requests.Session')
-def test_download_mock(mock_session_class):
+def test_download_mock(ingestor, tmp_path):
     """Test download functionality with mocked HTTP"""
     mock_response = Mock()
     mock_response.status_code = 200
@@ -101,83 +87,329 @@ def test_download_mock(mock_session_class):
     
     mock_session = Mock()
     mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        ingestor = GFSIngestor(base_dir=tmpdir)
-        ingestor.session = mock_session
-        
-        # Test download
-        test_url = "https://example.com/test.grib2"
-        output_path = Path(tmpdir) / "test.grib2"
+    ingestor.session = mock_session
+    
+    # Test download
+    test_url = "https://example.com/test.grib2"
+    output_path = tmp_path / "test.grib2"
+    
+    success, checksum = ingestor.download_file(test_url, output_path)
+    
+    assert success, "Download should succeed with mock"
+    assert output_path.exists(), "Output file should exist"
+    assert output_path.stat().st_size == 1000, "File size should match mock"
+    assert checksum == ingestor.calculate_checksum(output_path), "Streamed checksum should match file"
+
+def test_ranged_download_mock(ingestor, tmp_path):
+    """Test parallel byte-range download with mocked HTTP"""
+    content = bytes(range(256)) * 40  # 10240 bytes
+    
+    head_response = Mock()
+    head_response.status_code = 200
+    head_response.headers = {'accept-ranges': 'bytes', 'content-length': str(len(content))}
+    
+    def ranged_get(url, headers=None, **kwargs):
+        first, last = map(int, headers['Range'][len('bytes='):].split('-'))
+        response = Mock()
+        response.status_code = 206
+        response.iter_content.return_value = [content[first:last + 1]]
+        return response
+    
+    mock_session = Mock()
+    mock_session.head.return_value = head_response
+    mock_session.get.side_effect = ranged_get
+    
+    ingestor.session = mock_session
+    ingestor.RANGED_MIN_SIZE = 1024
+    
+    output_path = tmp_path / "test.grib2"
+    success, checksum = ingestor.download_file("https://example.com/test.grib2", output_path)
+    
+    assert success, "Ranged download should succeed with mock"
+    assert checksum == ingestor.calculate_checksum(output_path)
+    assert mock_session.get.call_count == ingestor.RANGE_SEGMENTS
+    assert output_path.read_bytes() == content, "Segments should reassemble the file"
+
+def test_resume_download_mock(ingestor, tmp_path):
+    """Test an interrupted download resumes from its .part file"""
+    content = b"0123456789" * 100
+    
+    output_path = tmp_path / "test.grib2"
+    part_path = tmp_path / "test.grib2.part"
+    part_path.write_bytes(content[:400])
+    ingestor._set_download_etag(output_path, '"v1"')
+    
+    mock_response = Mock()
+    mock_response.status_code = 206
+    mock_response.headers = {'content-length': '600'}
+    mock_response.iter_content = Mock(return_value=[content[400:]])
+    mock_response.raise_for_status = Mock()
+    
+    with patch.object(ingestor.session, 'head', return_value=Mock(status_code=404)), \
+         patch.object(ingestor.session, 'get', return_value=mock_response) as mock_get:
+        success, checksum = ingestor.download_file("https://example.com/test.grib2", output_path)
+    
+    assert success
+    assert mock_get.call_args.kwargs['headers'] == {'Range': 'bytes=400-', 'If-Range': '"v1"'}
+    assert output_path.read_bytes() == content, "Resumed file should be complete"
+    assert not part_path.exists(), "Partial file should be renamed into place"
+    assert checksum == ingestor.calculate_checksum(output_path)
+
+def test_resume_download_rangeable_server(ingestor, tmp_path):
+    """Test a .part of the same version is resumed rather than re-fetched in segments"""
+    content = b"0123456789" * 100
+    
+    output_path = tmp_path / "test.grib2"
+    part_path = tmp_path / "test.grib2.part"
+    part_path.write_bytes(content[:400])
+    ingestor._set_download_etag(output_path, '"v1"')
+    ingestor.RANGED_MIN_SIZE = 100
+    
+    head_response = Mock(status_code=200, headers={
+        'accept-ranges': 'bytes', 'content-length': '1000', 'etag': '"v1"'})
+    mock_response = Mock(status_code=206, headers={'content-length': '600'})
+    mock_response.iter_content = Mock(return_value=[content[400:]])
+    
+    with patch.object(ingestor.session, 'head', return_value=head_response), \
+         patch.object(ingestor.session, 'get', return_value=mock_response) as mock_get:
+        success, checksum = ingestor.download_file("https://example.com/test.grib2", output_path)
+    
+    assert success
+    assert mock_get.call_count == 1, "Only the missing tail should be requested"
+    assert mock_get.call_args.kwargs['headers'] == {'Range': 'bytes=400-', 'If-Range': '"v1"'}
+    assert output_path.read_bytes() == content
+    assert checksum == ingestor.calculate_checksum(output_path)
+
+def test_resume_after_crash_restarts(ingestor, tmp_path):
+    """Test a .part left preallocated to full size by a crash is downloaded again"""
+    content = b"0123456789" * 100
+    
+    output_path = tmp_path / "test.grib2"
+    part_path = tmp_path / "test.grib2.part"
+    part_path.write_bytes(content[:400] + bytes(600))
+    ingestor._set_download_etag(output_path, '"v1"')
+    
+    unsatisfiable = Mock(status_code=416)
+    full = Mock(status_code=200, headers={'content-length': '1000', 'ETag': '"v1"'})
+    full.iter_content = Mock(return_value=[content])
+    
+    with patch.object(ingestor.session, 'head', return_value=Mock(status_code=404)), \
+         patch.object(ingestor.session, 'get', side_effect=[unsatisfiable, full]) as mock_get:
+        success, checksum = ingestor.download_file("https://example.com/test.grib2", output_path)
+    
+    assert success
+    assert mock_get.call_args_list[0].kwargs['headers'] == {'Range': 'bytes=1000-', 'If-Range': '"v1"'}
+    assert 'headers' not in mock_get.call_args_list[1].kwargs
+    assert output_path.read_bytes() == content
+    assert checksum == ingestor.calculate_checksum(output_path)
+
+def test_list_cycles_mock(ingestor):
+    """Test cycle listing with mocked responses"""
+    # Mock the session's head method
+    with patch.object(ingestor.session, 'head') as mock_head:
+        # Simulate all cycles available
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_head.return_value = mock_response
         
-        success = ingestor.download_file(test_url, output_path)
+        cycles = ingestor.list_available_cycles("20250205")
         
-        assert success, "Download should succeed with mock"
-        assert output_path.exists(), "Output file should exist"
-        assert output_path.stat().st_size == 1000, "File size should match mock"
+        assert "00" in cycles
+        assert "06" in cycles
+        assert "12" in cycles
+        assert "18" in cycles
         
-        print("✅ Mock download tests passed")
+        for cycle in cycles.values():
+            assert cycle["available_on_server"] == True
+            assert cycle["available_locally"] == False
 
-def test_list_cycles_mock():
-    """Test cycle listing with mocked responses"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        ingestor = GFSIngestor(base_dir=tmpdir)
+def test_ingest_forecasts_existing_files(tmp_path):
+    """Test concurrent ingest returns stored metadata without downloading"""
+    ingestor = GFSIngestor(base_dir=str(tmp_path), json_sidecars=True)
+    
+    # Pretend two forecast hours were already ingested
+    for forecast_hour in (0, 3):
+        filename, file_path, metadata_path = ingestor._forecast_paths(
+            "20250205", "00", forecast_hour, "0p25")
+        file_path.write_bytes(b"GRIB")
+        with open(metadata_path, 'w') as f:
+            json.dump({"filename": filename, "status": "ingested"}, f)
+    
+    results = asyncio.run(ingestor.ingest_forecasts(
+        [("20250205", "00", 0), ("20250205", "00", 3, "0p25")]))
+    
+    assert [success for success, _ in results] == [True, True]
+    assert results[0][1]["filename"] == "gfs.t00z.pgrb2.0p25.f000"
+    assert results[1][1]["filename"] == "gfs.t00z.pgrb2.0p25.f003"
+
+class FakeAiohttpSession:
+    """Stands in for aiohttp.ClientSession, serving bodies[url] in two chunks"""
+    
+    def __init__(self, bodies, *args, **kwargs):
+        self.bodies = bodies
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    @contextlib.asynccontextmanager
+    async def get(self, url):
+        body = self.bodies[url]
         
-        # Mock the session's head method
-        with patch.object(ingestor.session, 'head') as mock_head:
-            # Simulate all cycles available
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_head.return_value = mock_response
-            
-            cycles = ingestor.list_available_cycles("20250205")
-            
-            assert "00" in cycles
-            assert "06" in cycles
-            assert "12" in cycles
-            assert "18" in cycles
-            
-            for cycle in cycles.values():
-                assert cycle["available_on_server"] == True
-                assert cycle["available_locally"] == False
-            
-            print("✅ Cycle listing tests passed")
-
-def run_all_tests():
-    """Run all tests"""
-    print("Running GFS ingestion proof-of-concept tests...")
-    print("=" * 60)
-    
-    tests = [
-        test_url_construction,
-        test_directory_structure,
-        test_checksum_calculation,
-        test_metadata_storage,
-        test_download_mock,
-        test_list_cycles_mock,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            failed += 1
-            print(f"❌ {test.__name__} failed: {e}")
-    
-    print("=" * 60)
-    print(f"Test summary: {passed} passed, {failed} failed")
-    
-    if failed == 0:
-        print("✅ All tests passed!")
-        return 0
-    else:
-        print("❌ Some tests failed")
-        return 1
+        async def iter_chunked(size):
+            yield body[:len(body) // 2]
+            if isinstance(body, bytes):
+                yield body[len(body) // 2:]
+            else:
+                raise ConnectionResetError("connection reset")
+        
+        yield Mock(headers={'ETag': '"v1"'}, raise_for_status=Mock(),
+                   content=Mock(iter_chunked=iter_chunked))
+
+def test_ingest_forecasts_download_mock(ingestor):
+    """Test concurrent ingest downloads into place and cleans up failures"""
+    pytest.importorskip("aiohttp")
+    pytest.importorskip("aiofiles")
+    content = b"GRIB" * 64
+    bodies = {
+        ingestor.construct_url("20250205", "00", 0): content,
+        # Fails halfway through
+        ingestor.construct_url("20250205", "00", 3): bytearray(content),
+    }
+    
+    with patch('aiohttp.ClientSession', lambda *args, **kwargs: FakeAiohttpSession(bodies)), \
+         patch.object(ingestor, 'extract_grib_metadata', return_value={}):
+        results = asyncio.run(ingestor.ingest_forecasts(
+            [("20250205", "00", 0), ("20250205", "00", 3)]))
+    
+    assert [success for success, _ in results] == [True, False]
+    assert results[0][1]["checksum_sha256"] == hashlib.sha256(content).hexdigest()
+    assert results[0][1]["etag"] == '"v1"', "ETag should be recorded for --revalidate"
+    
+    cycle_dir = ingestor.raw_dir / "20250205" / "00z"
+    assert (cycle_dir / "gfs.t00z.pgrb2.0p25.f000").read_bytes() == content
+    assert sorted(path.name for path in cycle_dir.iterdir()) == ["gfs.t00z.pgrb2.0p25.f000"], \
+        "A failed download should leave neither the file nor its .part"
+
+def test_grib_metadata_wgrib2_cached(ingestor, tmp_path):
+    """Test wgrib2 inventory parsing and the metadata cache"""
+    grib_path = tmp_path / "test.grib2"
+    grib_path.write_bytes(b"GRIB")
+    
+    inventory = Mock(stdout=(
+        "1:0:d=2025020500:PRMSL:mean sea level:anl:(1440 x 721)\n"
+        "2:990253:d=2025020500:TMP:2 m above ground:anl:(1440 x 721)\n"
+        "3:1897770:d=2025020500:UGRD:10 m above ground:anl:(1440 x 721)\n"
+    ))
+    with patch.dict(sys.modules, {'eccodes': None}), \
+         patch('gfs_poc.shutil.which', return_value='/usr/bin/wgrib2'), \
+         patch('gfs_poc.subprocess.run', return_value=inventory) as mock_run:
+        metadata = ingestor.extract_grib_metadata(grib_path)
+        again = ingestor.extract_grib_metadata(grib_path)
+    
+    assert mock_run.call_count == 1, "Unchanged file should be served from the cache"
+    assert metadata == again
+    assert metadata["message_count"] == 3
+    assert metadata["variables"] == ["PRMSL", "TMP", "UGRD"]
+    assert metadata["levels"] == ["mean sea level", "2 m above ground", "10 m above ground"]
+    assert metadata["grid_info"] == {"nx": 1440, "ny": 721}
+
+def test_metadata_index(ingestor):
+    """Test ingest metadata is recorded in and served from the SQLite index"""
+    filename, file_path, metadata_path = ingestor._forecast_paths(
+        "20250205", "06", 3, "0p25")
+    file_path.write_bytes(b"GRIB")
+    
+    with patch.object(ingestor, 'extract_grib_metadata', return_value={"variables": ["TMP"]}):
+        success, metadata = ingestor._finalize_ingest(
+            "20250205", "06", 3, "0p25", filename, file_path, metadata_path,
+            "https://example.com/" + filename)
+    
+    assert success
+    assert not metadata_path.exists(), "JSON sidecar is off by default"
+    assert ingestor.ingest_forecast("20250205", "06", 3) == (True, metadata)
+    
+    with patch.object(ingestor.session, 'head', return_value=Mock(status_code=404)):
+        cycles = ingestor.list_available_cycles("20250205")
+    assert cycles["06"]["available_locally"] == True
+    assert cycles["00"]["available_locally"] == False
+
+def test_verify_files(ingestor):
+    """Test parallel re-hashing of indexed files against their checksums"""
+    paths = []
+    for forecast_hour in (0, 3, 6):
+        filename, file_path, metadata_path = ingestor._forecast_paths(
+            "20250205", "00", forecast_hour, "0p25")
+        file_path.write_bytes(b"GRIB" * (forecast_hour + 1))
+        with patch.object(ingestor, 'extract_grib_metadata', return_value={}):
+            ingestor._finalize_ingest("20250205", "00", forecast_hour, "0p25", filename,
+                                      file_path, metadata_path, "https://example.com/")
+        paths.append(file_path)
+    
+    checksums = ingestor.calculate_checksums(paths, max_workers=3)
+    assert checksums == {path: ingestor.calculate_checksum(path) for path in paths}
+    
+    paths[1].write_bytes(b"corrupt")
+    paths[2].unlink()
+    assert ingestor.verify_files("20250205") == {
+        "gfs.t00z.pgrb2.0p25.f000": True,
+        "gfs.t00z.pgrb2.0p25.f003": False,
+        "gfs.t00z.pgrb2.0p25.f006": False,
+    }
+
+def test_subset_download_mock(ingestor, tmp_path):
+    """Test .idx parsing and downloading only the selected messages"""
+    content = b"AAAA" + b"BBBBBB" + b"CC" + b"DDDDD"
+    idx = ("1:0:d=2025020500:PRMSL:mean sea level:anl:\n"
+           "2:4:d=2025020500:TMP:2 m above ground:anl:\n"
+           "3:10:d=2025020500:UGRD:10 m above ground:anl:\n"
+           "4:12:d=2025020500:VGRD:10 m above ground:anl:\n")
+    assert parse_idx(idx, ["TMP:2 m above ground", "UGRD", "VGRD"]) == [(4, None)]
+    assert parse_idx(idx, ["PRMSL", "UGRD"]) == [(0, 3), (10, 11)]
+    
+    def fake_get(url, headers=None, **kwargs):
+        response = Mock()
+        response.raise_for_status = Mock()
+        if url.endswith(".idx"):
+            response.text = idx
+            return response
+        first, _, last = headers['Range'][len("bytes="):].partition("-")
+        body = content[int(first):int(last) + 1 if last else None]
+        response.status_code = 206
+        response.iter_content = Mock(return_value=[body])
+        return response
+    
+    output_path = tmp_path / "subset.grib2"
+    
+    with patch.object(ingestor.session, 'get', side_effect=fake_get):
+        success, checksum = ingestor.download_subset(
+            "https://example.com/test.grib2", output_path, ["PRMSL", "UGRD"])
+    
+    assert success
+    assert output_path.read_bytes() == b"AAAACC", "Only selected messages should be stored"
+    assert checksum == ingestor.calculate_checksum(output_path)
+
+def test_subset_kept_apart_from_full_file(ingestor):
+    """Test a subset is stored and indexed separately from the full file"""
+    def fake_download(url, output_path, *args):
+        output_path.write_bytes(b"GRIB" * (2 if args else 8))
+        return True, None
+    
+    with patch.object(ingestor, 'download_subset', side_effect=fake_download) as mock_subset, \
+         patch.object(ingestor, 'download_file', side_effect=fake_download) as mock_full, \
+         patch.object(ingestor, 'extract_grib_metadata', return_value={}):
+        _, subset = ingestor.ingest_forecast("20250205", "00", 0, variables=["PRMSL"])
+        _, full = ingestor.ingest_forecast("20250205", "00", 0)
+        again = ingestor.ingest_forecast("20250205", "00", 0, variables=["PRMSL"])
+    
+    assert mock_subset.call_count == 1 and mock_full.call_count == 1
+    assert subset["filename"] != full["filename"]
+    assert subset["subset_variables"] == ["PRMSL"] and full["subset_variables"] is None
+    assert full["file_size"] == 32
+    assert again == (True, subset), "Same selectors should reuse the stored subset"
 
 if __name__ == "__main__":
-    sys.exit(run_all_tests())
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-q"]))
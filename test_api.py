@@ -5,7 +5,6 @@ Quick test of OneWeather API
 
 import asyncio
 import httpx
-import sys
 
 async def test_api():
     """Test the forecast API"""
@@ -13,15 +12,23 @@ async def test_api():
     
     # Test demo endpoint (NYC)
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # First, check if API is running
-            health_response = await client.get("http://localhost:8000/health")
+        # One pooled client for every request; HTTP/2 (when the server
+        # offers it over TLS) multiplexes them onto a single connection
+        async with httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=8),
+            timeout=30.0,
+        ) as client:
+            # Health check and demo forecast are independent; issue together
+            health_response, demo_response = await asyncio.gather(
+                client.get("http://localhost:8000/health"),
+                client.get("http://localhost:8000/api/v1/forecast/test/demo"),
+            )
             print(f"✅ Health check: {health_response.status_code}")
             print(f"   Response: {health_response.json()}")
             
             # Test demo forecast
             print("\nTesting demo forecast (NYC)...")
-            demo_response = await client.get("http://localhost:8000/api/v1/forecast/test/demo")
             print(f"✅ Demo forecast: {demo_response.status_code}")
             
             if demo_response.status_code == 200:
@@ -80,7 +87,7 @@ async def test_direct_sources():
         
     except ImportError as e:
         print(f"❌ Import error: {e}")
-        print("Install dependencies: pip install httpx")
+        print("Install dependencies: pip install 'httpx[http2]'")
         return False
     except Exception as e:
         print(f"❌ Error: {e}")